@@ -0,0 +1,120 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# Compares the number of spawned processes and the wall time needed to
+# collect the jail table with one `appjail jail get` per attribute (the old
+# behavior) and with a single `appjail jail list` invocation.
+#
+#   python benchmarks/bench_get_jails.py --jails 150 --latency 0.01
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+_benchdir = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.insert(0, os.path.join(_benchdir, "..", "src"))
+
+async def per_attribute(keywords):
+    from appjail_gui.tools.appjail import get_jail
+    from appjail_gui.tools.appjail import list_jails
+
+    table = []
+
+    for jail in await list_jails():
+        table.append(await get_jail(jail, keywords))
+
+    return table
+
+async def batched(keywords):
+    from appjail_gui.tools.appjail import get_jails
+
+    return await get_jails(keywords)
+
+async def measure(func, keywords, counter):
+    with open(counter, "w"):
+        pass
+
+    start = time.perf_counter()
+    table = await func(keywords)
+    elapsed = time.perf_counter() - start
+
+    with open(counter) as fd:
+        spawns = len(fd.readlines())
+
+    return (table, spawns, elapsed)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark for appjail_gui.tools.appjail.get_jails"
+    )
+    parser.add_argument("--jails", default=150, type=int)
+    parser.add_argument("--latency", default=0.005, type=float)
+    parser.add_argument("--keywords",
+        default="name,status,type,version,network_ip4,ports"
+    )
+
+    args = parser.parse_args()
+
+    keywords = args.keywords.split(",")
+
+    # appjail_gui parses the command-line arguments when it is imported.
+    sys.argv = sys.argv[:1]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        counter = os.path.join(tmpdir, "counter")
+
+        os.environ["PATH"] = os.path.join(_benchdir, "stubs") + os.pathsep + os.environ["PATH"]
+        os.environ["FAKE_APPJAIL_JAILS"] = str(args.jails)
+        os.environ["FAKE_APPJAIL_LATENCY"] = str(args.latency)
+        os.environ["FAKE_APPJAIL_COUNTER"] = counter
+
+        (before, before_spawns, before_time) = asyncio.run(
+            measure(per_attribute, keywords, counter)
+        )
+        (after, after_spawns, after_time) = asyncio.run(
+            measure(batched, keywords, counter)
+        )
+
+    if before != after:
+        print("error: both methods returned different tables", file=sys.stderr)
+        return 1
+
+    print(f"jails: {args.jails}, keywords: {len(keywords)}, latency: {args.latency}s")
+    print(f"{'method':<16}{'spawns':>10}{'time (s)':>12}")
+    print(f"{'per-attribute':<16}{before_spawns:>10}{before_time:>12.3f}")
+    print(f"{'batched':<16}{after_spawns:>10}{after_time:>12.3f}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,435 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# Load test: simulates N concurrent browsers against one instance of the GUI
+# running on top of the fake appjail and appjail-director executables. Each
+# simulated client opens /, connects its websocket, and then types into
+# both search boxes, opens application dialogs and opens the logs of
+# projects. The time between an event and the first update sent back by the
+# server is its response latency. The event-loop lag is taken from the
+# appjail_gui_event_loop_lag_seconds histogram exposed on /metrics.
+#
+#   python benchmarks/bench_load.py --clients 1,10,25,50 --actions 20
+#   python benchmarks/bench_load.py --url http://127.0.0.1:8080 --clients 5
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import sys
+import tempfile
+import time
+import uuid
+
+import aiohttp
+import socketio
+
+from harness import add_fixture_arguments
+from harness import free_port
+from harness import git_revision
+from harness import percentile
+from harness import prepare_fixture
+from harness import start_server
+from harness import stop_server
+
+ELEMENTS_PATTERN = re.compile(r"parseElements\(String\.raw`(.*?)`\)", re.S)
+CLIENT_ID_PATTERN = re.compile(r"'client_id': '([^']+)'")
+LAG_PATTERN = re.compile(r'^appjail_gui_event_loop_lag_seconds_bucket\{le="([^"]+)"\} (\d+)$', re.M)
+ACTIONS = ("store_search", "workspace_search", "open_dialog", "open_logs")
+
+def parse_page(html):
+    client_id = CLIENT_ID_PATTERN.search(html).group(1)
+    elements = json.loads(ELEMENTS_PATTERN.search(html).group(1))
+
+    return (client_id, elements)
+
+def get_listener(element, event_type):
+    for event in element.get("events", ()):
+        if event["type"] == event_type:
+            return event["listener_id"]
+
+    return None
+
+def find_tabs(elements):
+    for (element_id, element) in elements.items():
+        if element["tag"] == "q-tabs":
+            listener = get_listener(element, "update:modelValue")
+
+            if listener is not None:
+                return (int(element_id), listener)
+
+    return None
+
+def find_targets(elements):
+    targets = {
+        "inputs" : [],
+        "cards" : [],
+        "logs" : []
+    }
+
+    for element_id in sorted(elements, key=int):
+        element = elements[element_id]
+        tag = element["tag"]
+        props = element.get("props", {})
+
+        # Hidden elements ignore events, as a browser can't click them.
+        if "hidden" in element.get("class", ()):
+            continue
+
+        if tag == "nicegui-input":
+            listener = get_listener(element, "update:value")
+
+            if listener is not None:
+                targets["inputs"].append((int(element_id), listener))
+        elif tag == "q-btn":
+            listener = get_listener(element, "click")
+
+            if listener is None:
+                continue
+
+            if props.get("no-caps") \
+                    and props.get("color") == "white":
+                targets["cards"].append((int(element_id), listener))
+                continue
+
+            for child in element.get("children", ()):
+                child = elements.get(str(child), {})
+
+                if child.get("tag") == "q-icon" \
+                        and child.get("props", {}).get("name") == "troubleshoot":
+                    targets["logs"].append((int(element_id), listener))
+
+    return targets
+
+async def scrape_lag(session, url):
+    async with session.get(f"{url}/metrics") as response:
+        text = await response.text()
+
+    buckets = []
+
+    for (le, count) in LAG_PATTERN.findall(text):
+        buckets.append((math.inf if le == "+Inf" else float(le), int(count)))
+
+    return buckets
+
+def lag_percentiles(before, after):
+    before = dict(before)
+    delta = [(le, count - before.get(le, 0)) for (le, count) in after]
+
+    if len(delta) == 0 \
+            or delta[-1][1] == 0:
+        return { "samples" : 0, "p50" : None, "p99" : None, "max" : None }
+
+    total = delta[-1][1]
+
+    def upper_bound(percent):
+        for (le, count) in delta:
+            if count >= total * percent / 100:
+                return le
+
+    def format_bound(le):
+        # +Inf can't be written as JSON.
+        return None if le == math.inf else le
+
+    highest = None
+
+    for (le, count) in delta:
+        if count == total:
+            highest = le
+            break
+
+    return {
+        "samples" : total,
+        "p50" : format_bound(upper_bound(50)),
+        "p99" : format_bound(upper_bound(99)),
+        "max" : format_bound(highest)
+    }
+
+async def simulate_client(url, number, args, session):
+    rnd = random.Random(args.seed + number)
+
+    stats = {
+        "page" : None,
+        "actions" : { action : [] for action in ACTIONS },
+        "timeouts" : { action : 0 for action in ACTIONS + ("open_tab",) }
+    }
+
+    start = time.perf_counter()
+
+    async with session.get(f"{url}/") as response:
+        html = await response.text()
+
+    stats["page"] = time.perf_counter() - start
+
+    (client_id, elements) = parse_page(html)
+
+    sio = socketio.AsyncClient(reconnection=False)
+    updated = asyncio.Event()
+
+    async def on_update(msg):
+        for (element_id, element) in msg.items():
+            if element is None:
+                elements.pop(element_id, None)
+            else:
+                elements[element_id] = element
+
+        updated.set()
+
+    async def on_notify(*_):
+        updated.set()
+
+    sio.on("update", on_update)
+    sio.on("notify", on_notify)
+
+    await sio.connect(f"{url}?client_id={client_id}",
+        socketio_path="/_nicegui_ws/socket.io",
+        transports=["websocket"],
+        wait_timeout=args.timeout
+    )
+
+    try:
+        await sio.call("handshake", {
+            "client_id" : client_id,
+            "tab_id" : str(uuid.uuid4())
+        })
+
+        # Tabs are built when they are activated for the first time.
+        tabs = find_tabs(elements)
+
+        if tabs is not None:
+            for tab in ("Workspace", "Store"):
+                updated.clear()
+
+                await sio.emit("event", {
+                    "id" : tabs[0],
+                    "client_id" : client_id,
+                    "listener_id" : tabs[1],
+                    "args" : [json.dumps(tab)]
+                })
+
+                try:
+                    await asyncio.wait_for(updated.wait(), args.timeout)
+                except asyncio.TimeoutError:
+                    stats["timeouts"]["open_tab"] += 1
+
+        for _ in range(args.actions):
+            action = rnd.choice(ACTIONS)
+
+            # Refreshes replace elements, so the targets are looked up again.
+            targets = find_targets(elements)
+
+            if action == "store_search":
+                if len(targets["inputs"]) < 1:
+                    continue
+
+                (element_id, listener) = targets["inputs"][0]
+                event_args = [json.dumps("app-%d" % rnd.randrange(max(1, args.applications)))]
+            elif action == "workspace_search":
+                if len(targets["inputs"]) < 2:
+                    continue
+
+                (element_id, listener) = targets["inputs"][1]
+                event_args = [json.dumps("project-%d" % rnd.randrange(max(1, args.projects)))]
+            elif action == "open_dialog":
+                if len(targets["cards"]) == 0:
+                    continue
+
+                (element_id, listener) = rnd.choice(targets["cards"])
+                event_args = []
+            else:
+                if len(targets["logs"]) == 0:
+                    continue
+
+                (element_id, listener) = rnd.choice(targets["logs"])
+                event_args = []
+
+            updated.clear()
+
+            start = time.perf_counter()
+
+            await sio.emit("event", {
+                "id" : element_id,
+                "client_id" : client_id,
+                "listener_id" : listener,
+                "args" : event_args
+            })
+
+            try:
+                await asyncio.wait_for(updated.wait(), args.timeout)
+            except asyncio.TimeoutError:
+                stats["timeouts"][action] += 1
+            else:
+                stats["actions"][action].append(time.perf_counter() - start)
+
+            await asyncio.sleep(args.think)
+    finally:
+        await sio.disconnect()
+
+    return stats
+
+async def run_level(url, clients, args):
+    async with aiohttp.ClientSession() as session:
+        lag_before = await scrape_lag(session, url)
+
+        results = await asyncio.gather(
+            *(simulate_client(url, number, args, session) for number in range(clients)),
+            return_exceptions=True
+        )
+
+        lag_after = await scrape_lag(session, url)
+
+    pages = []
+    actions = { action : [] for action in ACTIONS }
+    timeouts = { action : 0 for action in ACTIONS + ("open_tab",) }
+    errors = 0
+
+    for result in results:
+        if isinstance(result, BaseException):
+            print(f"warning: client failed: {result.__class__.__name__}: {result}", file=sys.stderr)
+
+            errors += 1
+            continue
+
+        pages.append(result["page"])
+        for (action, count) in result["timeouts"].items():
+            timeouts[action] += count
+
+        for (action, samples) in result["actions"].items():
+            actions[action].extend(samples)
+
+    every_action = [sample for samples in actions.values() for sample in samples]
+
+    return {
+        "clients" : clients,
+        "errors" : errors,
+        "timeouts" : sum(timeouts.values()),
+        "page" : {
+            "p50" : percentile(pages, 50),
+            "p99" : percentile(pages, 99)
+        },
+        "actions" : {
+            "count" : len(every_action),
+            "p50" : percentile(every_action, 50),
+            "p99" : percentile(every_action, 99)
+        },
+        "by_action" : {
+            action : {
+                "count" : len(samples),
+                "timeouts" : timeouts[action],
+                "p50" : percentile(samples, 50),
+                "p99" : percentile(samples, 99)
+            } for (action, samples) in actions.items()
+        },
+        "loop_lag" : lag_percentiles(lag_before, lag_after)
+    }
+
+def format_seconds(value):
+    if value is None:
+        return "-"
+
+    return f"{value:.4f}"
+
+def print_levels(levels):
+    print(f"{'clients':>8}{'page p50':>10}{'page p99':>10}{'act p50':>10}{'act p99':>10}"
+          f"{'lag p50':>10}{'lag p99':>10}{'timeouts':>10}{'errors':>8}")
+
+    for level in levels:
+        print(f"{level['clients']:>8}"
+              f"{format_seconds(level['page']['p50']):>10}"
+              f"{format_seconds(level['page']['p99']):>10}"
+              f"{format_seconds(level['actions']['p50']):>10}"
+              f"{format_seconds(level['actions']['p99']):>10}"
+              f"{format_seconds(level['loop_lag']['p50']):>10}"
+              f"{format_seconds(level['loop_lag']['p99']):>10}"
+              f"{level['timeouts']:>10}"
+              f"{level['errors']:>8}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load test for appjail-gui"
+    )
+    add_fixture_arguments(parser)
+    parser.add_argument("--clients", default="1,5,10,25",
+        help="comma-separated number of concurrent clients of each level")
+    parser.add_argument("--actions", default=20, type=int,
+        help="actions performed by each client")
+    parser.add_argument("--think", default=0.2, type=float,
+        help="seconds each client waits between two actions")
+    parser.add_argument("--timeout", default=10, type=float,
+        help="seconds to wait for the response to an action")
+    parser.add_argument("--seed", default=0, type=int)
+    parser.add_argument("--url", default=None,
+        help="use a running instance instead of starting one with the fake tools")
+    parser.add_argument("--output", default=None,
+        help="write the results as JSON to this file")
+
+    args = parser.parse_args()
+
+    levels = []
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        proc = None
+
+        if args.url is None:
+            port = free_port()
+
+            proc = start_server(prepare_fixture(tmpdir, args), port)
+
+            url = f"http://127.0.0.1:{port}"
+        else:
+            url = args.url.rstrip("/")
+
+        try:
+            for clients in (int(clients) for clients in args.clients.split(",")):
+                levels.append(asyncio.run(run_level(url, clients, args)))
+        finally:
+            if proc is not None:
+                stop_server(proc)
+
+    print_levels(levels)
+
+    if args.output is not None:
+        report = {
+            "revision" : git_revision(),
+            "date" : time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "parameters" : {
+                key : value for (key, value) in vars(args).items() if key != "output"
+            },
+            "levels" : levels
+        }
+
+        with open(args.output, "w") as fd:
+            json.dump(report, fd, indent=4)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
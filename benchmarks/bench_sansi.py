@@ -0,0 +1,153 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# Micro-benchmark of appjail_gui.tools.text over a synthetic build log that
+# looks like the output of `appjail-director up` (colored makejail messages,
+# pkg(8) progress and compiler output).
+#
+#   python benchmarks/bench_sansi.py --size 8
+
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+
+_benchdir = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.insert(0, os.path.join(_benchdir, "..", "src"))
+
+def legacy_sansi(content):
+    lines = []
+
+    for line in content.splitlines():
+        line = re.sub(r"(\x9B|\x1B\[)[0-?]*[ -\/]*[@-~]", "", line)
+
+        lines.append(line)
+
+    return "\n".join(lines)
+
+# Line boundaries other than "\n" next to escape sequences.
+EDGE_CASES = (
+    "",
+    "\n",
+    "a\r\x1b[0m\nb",
+    "a\r\nb\rc\n\n",
+    "a\x0bb\x0cc\x1cd\x1de\x1ef\x85g\u2028h\u2029i",
+    "\x1b[1;31mred\x1b[0m\r\x1b[2K\x0c\x1b[0m\r\n\x9b0m\r",
+    "unterminated \x1b[1;3\rtail"
+)
+
+def build_log(size):
+    rnd = random.Random(0)
+
+    templates = (
+        "\x1b[1;32m[00:00:%02d] [ debug ] [web]\x1b[0m Running: RUN pkg install -y nginx\n",
+        "\x1b[1;34m[00:00:%02d] [ info  ] [web]\x1b[0m Updating FreeBSD repository catalogue...\n",
+        "[%d/120] Fetching py311-setuptools-63.1.0_1.pkg: .......... done\n",
+        "\x1b[33mwarning:\x1b[0m unused variable 'n%d' [-Wunused-variable]\n",
+        "cc -O2 -pipe -fstack-protector-strong -c src/module%d.c -o src/module.o\n",
+        "\x1b[1;31m[00:00:%02d] [ error ] [db]\x1b[0m Makejail returned a non-zero exit status.\n",
+        "Extracting nginx-1.26.1_1,3: .......... done\r\n",
+        "\x1b[2KFetching nginx-1.26.1_1,3.pkg: %d%%\r\x1b[0m\n",
+        "\x0c\x1b[1mpage\x1b[0m\x0bbreak\n"
+    )
+
+    lines = []
+    length = 0
+
+    while length < size:
+        line = rnd.choice(templates)
+
+        if "%" in line:
+            line = line % rnd.randint(0, 59)
+
+        lines.append(line)
+        length += len(line)
+
+    return "".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark for appjail_gui.tools.text"
+    )
+    parser.add_argument("--size", default=8, type=float,
+        help="size of the log in MiB"
+    )
+    parser.add_argument("--chunk-size", default=4096, type=int)
+    parser.add_argument("--repeat", default=5, type=int)
+
+    args = parser.parse_args()
+
+    # appjail_gui parses the command-line arguments when it is imported.
+    sys.argv = sys.argv[:1]
+
+    from appjail_gui.tools.text import ANSIStripper
+    from appjail_gui.tools.text import sansi
+
+    content = build_log(int(args.size * 1024 * 1024))
+
+    def incremental():
+        stripper = ANSIStripper()
+
+        chunks = []
+
+        for index in range(0, len(content), args.chunk_size):
+            chunks.append(stripper.feed(content[index:index + args.chunk_size]))
+
+        chunks.append(stripper.flush())
+
+        return "".join(chunks)
+
+    for sample in (content, *EDGE_CASES):
+        if legacy_sansi(sample) != sansi(sample):
+            print(f"error: sansi() differs from the legacy implementation for {sample[:80]!r}", file=sys.stderr)
+            return 1
+
+    if sansi(incremental()) != sansi(content):
+        print("error: ANSIStripper differs from sansi()", file=sys.stderr)
+        return 1
+
+    print(f"log: {len(content) / 1024 / 1024:.1f} MiB, {content.count(chr(10))} lines")
+    print(f"{'method':<28}{'best (s)':>12}{'MiB/s':>10}")
+
+    for (name, func) in (
+        ("legacy (per line)", lambda: legacy_sansi(content)),
+        ("sansi (whole buffer)", lambda: sansi(content)),
+        (f"ANSIStripper ({args.chunk_size} B chunks)", incremental)
+    ):
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+
+        print(f"{name:<28}{best:>12.4f}{args.size / best:>10.1f}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
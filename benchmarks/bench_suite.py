@@ -0,0 +1,195 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# Times the hot paths of the GUI against the fake appjail and
+# appjail-director executables and writes the results as JSON, so that
+# they can be compared between commits.
+#
+#   python benchmarks/bench_suite.py --jails 200 --projects 100 --output before.json
+#   git checkout ...
+#   python benchmarks/bench_suite.py --jails 200 --projects 100 --output after.json
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import urllib.request
+
+from harness import add_fixture_arguments
+from harness import free_port
+from harness import git_revision
+from harness import import_appjail_gui
+from harness import prepare_fixture
+from harness import start_server
+from harness import stop_server
+from harness import summarize
+
+async def measure(func, repeat, before=None):
+    samples = []
+
+    for _ in range(repeat):
+        if before is not None:
+            before()
+
+        start = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - start)
+
+    return summarize(samples)
+
+async def run_suite(args, logdir):
+    from appjail_gui.tools import catalog
+    from appjail_gui.tools.appjail import get_jails
+    from appjail_gui.tools.constants import CATALOG_INDEX
+    from appjail_gui.tools.director import get_projects
+    from appjail_gui.tools.files import list_logfiles
+    from appjail_gui.tools.jails import JAILS_KEYWORDS
+
+    from nicegui import run
+
+    def drop_catalog():
+        catalog._index = None
+
+        try:
+            os.remove(CATALOG_INDEX)
+        except FileNotFoundError:
+            pass
+
+    def drop_memory():
+        catalog._index = None
+
+    results = {}
+
+    results["get_jails"] = await measure(
+        lambda: get_jails(JAILS_KEYWORDS), args.repeat
+    )
+    results["get_projects"] = await measure(get_projects, args.repeat)
+    results["get_applications (cold)"] = await measure(
+        catalog.get_applications, args.repeat, drop_catalog
+    )
+    results["get_applications (index)"] = await measure(
+        catalog.get_applications, args.repeat, drop_memory
+    )
+    results["get_applications (warm)"] = await measure(
+        catalog.get_applications, args.repeat
+    )
+    results["listfiles_window (data)"] = await measure(
+        lambda: run.io_bound(list_logfiles, logdir), args.repeat
+    )
+
+    return results
+
+def measure_page(env, repeat):
+    port = free_port()
+
+    proc = start_server(env, port)
+
+    try:
+        url = f"http://127.0.0.1:{port}/"
+
+        # The first request pays for the imports and caches of the server.
+        start = time.perf_counter()
+
+        with urllib.request.urlopen(url) as response:
+            response.read()
+
+        first = time.perf_counter() - start
+
+        samples = []
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+
+            with urllib.request.urlopen(url) as response:
+                response.read()
+
+            samples.append(time.perf_counter() - start)
+    finally:
+        stop_server(proc)
+
+    return (first, summarize(samples))
+
+def print_results(results):
+    print(f"{'benchmark':<28}{'median (s)':>12}{'p99 (s)':>12}{'max (s)':>12}")
+
+    for (name, result) in results.items():
+        print(f"{name:<28}{result['median']:>12.4f}{result['p99']:>12.4f}{result['max']:>12.4f}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark suite for appjail-gui"
+    )
+    add_fixture_arguments(parser)
+    parser.add_argument("--repeat", default=10, type=int,
+        help="number of runs of each benchmark")
+    parser.add_argument("--no-page", default=False, action="store_true",
+        help="don't start a server to measure the rendering of /")
+    parser.add_argument("--output", default=None,
+        help="write the results as JSON to this file")
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env = prepare_fixture(tmpdir, args)
+
+        import_appjail_gui(env)
+
+        results = asyncio.run(run_suite(args, env["FAKE_DIRECTOR_LOGDIR"]))
+
+        if not args.no_page:
+            (first, results["render /"]) = measure_page(env, args.repeat)
+        else:
+            first = None
+
+    print_results(results)
+
+    if args.output is not None:
+        report = {
+            "revision" : git_revision(),
+            "date" : time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python" : platform.python_version(),
+            "platform" : platform.platform(),
+            "parameters" : {
+                key : value for (key, value) in vars(args).items() if key != "output"
+            },
+            "first_render" : first,
+            "results" : results
+        }
+
+        with open(args.output, "w") as fd:
+            json.dump(report, fd, indent=4)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
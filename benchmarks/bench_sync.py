@@ -0,0 +1,142 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# Measures how long it takes to prepare the workspace of a project that is
+# deployed again: rmtree + copytree (the old behavior) against
+# appjail_gui.tools.sync.sync_tree.
+#
+#   python benchmarks/bench_sync.py --files 2000 --size 256 --changed 10
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+_benchdir = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.insert(0, os.path.join(_benchdir, "..", "src"))
+
+def build_project(project, files, size, rnd):
+    for index in range(files):
+        directory = os.path.join(project, "assets", "d%02d" % (index % 32))
+
+        os.makedirs(directory, exist_ok=True)
+
+        with open(os.path.join(directory, "f%05d.bin" % index), "wb") as fd:
+            fd.write(rnd.randbytes(size))
+
+    with open(os.path.join(project, "appjail-director.yml"), "w") as fd:
+        fd.write("services:\n  web:\n    makejail: Makejail\n")
+
+def change_files(project, changed, rnd):
+    pathnames = []
+
+    for (dirpath, _, filenames) in os.walk(os.path.join(project, "assets")):
+        for file in filenames:
+            pathnames.append(os.path.join(dirpath, file))
+
+    pathnames.sort()
+
+    for pathname in rnd.sample(pathnames, min(changed, len(pathnames))):
+        size = os.path.getsize(pathname)
+
+        with open(pathname, "wb") as fd:
+            fd.write(rnd.randbytes(size))
+
+def copytree(project, workspace):
+    if os.path.isdir(workspace):
+        shutil.rmtree(workspace)
+
+    shutil.copytree(project, workspace,
+        symlinks=True
+    )
+
+def measure(func, *args):
+    start = time.perf_counter()
+    func(*args)
+
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark for appjail_gui.tools.sync"
+    )
+    parser.add_argument("--files", default=2000, type=int)
+    parser.add_argument("--size", default=256, type=int,
+        help="size of each file in KiB"
+    )
+    parser.add_argument("--changed", default=10, type=int,
+        help="files changed between deploys"
+    )
+    parser.add_argument("--hardlinks", default=False, action="store_true")
+    parser.add_argument("--directory", default=None,
+        help="where to create the trees (default: a temporary directory)"
+    )
+
+    args = parser.parse_args()
+
+    # appjail_gui parses the command-line arguments when it is imported.
+    sys.argv = sys.argv[:1]
+
+    from appjail_gui.tools.sync import sync_tree
+
+    rnd = random.Random(0)
+
+    with tempfile.TemporaryDirectory(dir=args.directory) as tmpdir:
+        project = os.path.join(tmpdir, "project")
+        old_workspace = os.path.join(tmpdir, "workspace-copytree")
+        new_workspace = os.path.join(tmpdir, "workspace-sync")
+
+        build_project(project, args.files, args.size * 1024, rnd)
+
+        first_copytree = measure(copytree, project, old_workspace)
+        first_sync = measure(sync_tree, project, new_workspace, args.hardlinks)
+
+        change_files(project, args.changed, rnd)
+
+        redeploy_copytree = measure(copytree, project, old_workspace)
+        redeploy_sync = measure(sync_tree, project, new_workspace, args.hardlinks)
+
+        summary = sync_tree(project, new_workspace, args.hardlinks)
+
+    total = args.files * args.size / 1024
+
+    print(f"project: {args.files} files, {total:.1f} MiB, {args.changed} changed between deploys")
+    print(f"{'method':<24}{'first (s)':>12}{'redeploy (s)':>14}")
+    print(f"{'rmtree + copytree':<24}{first_copytree:>12.3f}{redeploy_copytree:>14.3f}")
+    print(f"{'sync_tree':<24}{first_sync:>12.3f}{redeploy_sync:>14.3f}")
+    print(f"no-op sync: {summary}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
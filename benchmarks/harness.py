@@ -0,0 +1,194 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# Helpers shared by the benchmarks that need the fake appjail and
+# appjail-director executables, a catalog of applications or a running
+# instance of the GUI.
+
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+_benchdir = os.path.dirname(os.path.abspath(__file__))
+_srcdir = os.path.join(_benchdir, "..", "src")
+
+STUBS = os.path.join(_benchdir, "stubs")
+
+def add_fixture_arguments(parser):
+    parser.add_argument("--jails", default=100, type=int,
+        help="number of jails reported by the fake appjail")
+    parser.add_argument("--projects", default=50, type=int,
+        help="number of projects reported by the fake appjail-director")
+    parser.add_argument("--applications", default=200, type=int,
+        help="number of applications in the catalog")
+    parser.add_argument("--logfiles", default=100, type=int,
+        help="number of files in the log directory of the projects")
+    parser.add_argument("--latency", default=0.005, type=float,
+        help="seconds spent by each call to the fake tools")
+    parser.add_argument("--output-size", default=4096, type=int,
+        help="bytes written by the fake tools for commands that print a log")
+
+def prepare_fixture(basedir, args):
+    homedir = os.path.join(basedir, "home")
+    projectsdir = os.path.join(homedir, ".appjail-gui", "data", "projects")
+    logdir = os.path.join(basedir, "logs")
+
+    for index in range(args.applications):
+        project = os.path.join(projectsdir, "app-%d" % index)
+
+        os.makedirs(project, exist_ok=True)
+
+        with open(os.path.join(project, "info.json"), "w") as fd:
+            json.dump({
+                "name" : "App-%d" % index,
+                "description" : "Fake application number %d used by the benchmarks." % index,
+                "www" : "https://example.org/app-%d" % index
+            }, fd)
+
+        with open(os.path.join(project, "appjail-director.yml"), "w") as fd:
+            fd.write("services:\n  web:\n    makejail: Makejail\n")
+
+    for index in range(args.logfiles):
+        directory = os.path.join(logdir, "service-%d" % (index % 10))
+
+        os.makedirs(directory, exist_ok=True)
+
+        with open(os.path.join(directory, "log-%d.log" % index), "w") as fd:
+            fd.write("line\n" * (args.output_size // 5))
+
+    os.makedirs(logdir, exist_ok=True)
+
+    env = dict(os.environ)
+    env["HOME"] = homedir
+    env["PATH"] = STUBS + os.pathsep + env["PATH"]
+    env["FAKE_APPJAIL_JAILS"] = str(args.jails)
+    env["FAKE_APPJAIL_LATENCY"] = str(args.latency)
+    env["FAKE_APPJAIL_OUTPUT_SIZE"] = str(args.output_size)
+    env["FAKE_DIRECTOR_PROJECTS"] = str(args.projects)
+    env["FAKE_DIRECTOR_LATENCY"] = str(args.latency)
+    env["FAKE_DIRECTOR_OUTPUT_SIZE"] = str(args.output_size)
+    env["FAKE_DIRECTOR_LOGDIR"] = logdir
+
+    return env
+
+def import_appjail_gui(env):
+    # appjail_gui reads $HOME and parses the command-line arguments when it
+    # is imported, so the environment must be ready before that.
+    os.environ.update(env)
+
+    sys.argv = sys.argv[:1]
+
+    if _srcdir not in sys.path:
+        sys.path.insert(0, _srcdir)
+
+    import appjail_gui
+
+    return appjail_gui
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+
+        return sock.getsockname()[1]
+
+def start_server(env, port, timeout=60):
+    code = "import sys; sys.path.insert(0, %r); import appjail_gui; appjail_gui.cli()" % _srcdir
+
+    proc = subprocess.Popen(
+        [sys.executable, "-c", code, "--host-addr", "127.0.0.1", "--host-port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"The server exited with status {proc.returncode}")
+
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=1):
+                return proc
+        except OSError:
+            time.sleep(0.2)
+
+    stop_server(proc)
+
+    raise RuntimeError("The server didn't start in time")
+
+def stop_server(proc):
+    proc.terminate()
+
+    try:
+        proc.wait(10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+def percentile(samples, percent):
+    samples = sorted(samples)
+
+    if len(samples) == 0:
+        return None
+
+    index = min(len(samples) - 1, max(0, round(percent / 100 * len(samples)) - 1))
+
+    return samples[index]
+
+def summarize(samples):
+    return {
+        "runs" : len(samples),
+        "min" : min(samples),
+        "median" : statistics.median(samples),
+        "mean" : statistics.fmean(samples),
+        "p99" : percentile(samples, 99),
+        "max" : max(samples)
+    }
+
+def git_revision():
+    try:
+        proc = subprocess.run(["git", "rev-parse", "HEAD"],
+            cwd=_benchdir,
+            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+    except OSError:
+        return None
+
+    if proc.returncode != 0:
+        return None
+
+    return proc.stdout.strip()
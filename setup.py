@@ -35,6 +35,11 @@ setup(
         "nicegui",
         "commentjson"
     ],
+    extras_require={
+        "thumbnails" : [
+            "Pillow"
+        ]
+    },
     entry_points={
         "console_scripts" : [
             "appjail-gui = appjail_gui.__init__:cli"
@@ -29,45 +29,104 @@
 
 import asyncio
 import inspect
-import importlib.util
-import json
 import os
 import re
 import shlex
 import shutil
 import subprocess
 import sys
+import time
 
-import commentjson
 import starlette.exceptions
 
+from appjail_gui.tools.api import API_ROUTE
+from appjail_gui.tools.api import api_error
+from appjail_gui.tools.appjail import destroy_jail
+from appjail_gui.tools.appjail import restart_jail
+from appjail_gui.tools.appjail import start_jail
+from appjail_gui.tools.appjail import stop_jail
+from appjail_gui.tools.bulk import BULK_BUSY
+from appjail_gui.tools.bulk import BULK_DONE
+from appjail_gui.tools.bulk import BULK_FAILED
+from appjail_gui.tools.bulk import BULK_RUNNING
+from appjail_gui.tools.bulk import run_bulk
+from appjail_gui.tools.catalog import get_applications
 from appjail_gui.tools.constants import *
-from appjail_gui.tools.director import check_project
+from appjail_gui.tools.deploy import check_deployment
+from appjail_gui.tools.deploy import deploy_workspace
+from appjail_gui.tools.director import describe_project
 from appjail_gui.tools.director import destroy_project
 from appjail_gui.tools.director import destroy_workspace
 from appjail_gui.tools.director import deploy_project
 from appjail_gui.tools.director import down_project
-from appjail_gui.tools.director import get_project_info
-from appjail_gui.tools.director import get_projects
+from appjail_gui.tools.files import format_size
 from appjail_gui.tools.files import listfiles_window
 from appjail_gui.tools.files import open_consolelog
+from appjail_gui.tools.files import open_joblog
+from appjail_gui.tools.jails import add_jails_listener
+from appjail_gui.tools.jails import get_cached_jails
+from appjail_gui.tools.jails import invalidate_jails
+from appjail_gui.tools.jails import JAILS_KEYWORDS
+from appjail_gui.tools.jails import start_jails_collector
+from appjail_gui.tools.jobs import add_jobs_listener
+from appjail_gui.tools.jobs import get_active_job
+from appjail_gui.tools.jobs import get_jobs
+from appjail_gui.tools.jobs import JOB_DONE
+from appjail_gui.tools.jobs import JOB_FAILED
+from appjail_gui.tools.jobs import JOB_PRIORITY_HIGH
+from appjail_gui.tools.jobs import JOB_QUEUED
+from appjail_gui.tools.jobs import JOB_RUNNING
+from appjail_gui.tools.jobs import start_job_workers
+from appjail_gui.tools.jobs import submit_job
+from appjail_gui.tools.metrics import PAGE_RENDER
+from appjail_gui.tools.metrics import start_loop_lag_probe
 from appjail_gui.tools.notification import my_notify
+from appjail_gui.tools.plugins import load_plugin
+from appjail_gui.tools.plugins import scan_plugins
 from appjail_gui.tools.process import run_proc
+from appjail_gui.tools.projects import add_projects_listener
+from appjail_gui.tools.projects import get_cached_projects
+from appjail_gui.tools.projects import get_cached_projects_nowait
+from appjail_gui.tools.projects import invalidate_projects
+from appjail_gui.tools.projects import start_projects_poller
+from appjail_gui.tools.projects import PROJECT_STATUS_COLORS
+from appjail_gui.tools.projects import PROJECT_STATUSES
+from appjail_gui.tools.sync import write_files
 from appjail_gui.tools.sysexits import *
+from appjail_gui.tools.thumbnails import get_thumbnail_url
+from appjail_gui.tools.thumbnails import make_thumbnail
+from appjail_gui.tools.thumbnails import thumbnails_enabled
+from appjail_gui.tools.tracing import action_fanout
+from appjail_gui.tools.tracing import format_started
+from appjail_gui.tools.tracing import frequent_commands
+from appjail_gui.tools.tracing import slowest_commands
+from appjail_gui.tools.tracing import trace_action
+from appjail_gui.tools.watchdog import get_offenders
+from appjail_gui.tools.watchdog import get_stalls
+from appjail_gui.tools.watchdog import start_watchdog
+from appjail_gui.tools.watchdog import watchdog_enabled
 
 if NATIVE_MODE:
     import multiprocessing
 
     multiprocessing.set_start_method("spawn", force=True)
 
-from nicegui import app, Client, run, ui
+from nicegui import app, background_tasks, Client, run, ui
+from nicegui.events import handle_event
 from nicegui.logging import log
 from nicegui.page import page
 
-projects_refreshable = None
-
 @ui.page("/", response_timeout=RESPONSE_TIMEOUT)
 async def main():
+    start = time.perf_counter()
+
+    try:
+        with trace_action("page /"):
+            await write_main()
+    finally:
+        PAGE_RENDER.observe(time.perf_counter() - start, page="/")
+
+async def write_main():
     for program in REQUIREMENTS: 
         if shutil.which(program) is None:
             log.error(f"{program}: Program required but not found.")
@@ -79,97 +138,142 @@ async def main():
         with ui.tabs() as tabs:
             tab_store = ui.tab("Store", icon="store")
             tab_workspace = ui.tab("Workspace", icon="workspaces")
+            tab_jails = ui.tab("Jails", icon="dns")
+            tab_jobs = ui.tab("Jobs", icon="pending_actions")
             tab_plugins = ui.tab("Plugins", icon="extension")
 
-    with ui.tab_panels(tabs, value="Store").classes("w-full items-center"):
-        with ui.tab_panel("Store").classes("w-full items-center"):
-            await write_store()
+    writers = {
+        "Store" : write_store,
+        "Workspace" : write_workspace,
+        "Jails" : write_jails,
+        "Jobs" : write_jobs,
+        "Plugins" : write_plugins
+    }
+
+    panels = {}
+    built = set()
+
+    # Only the visible tab is built with the page. The others show a
+    # skeleton until they are activated for the first time.
+    async def build_panel(name):
+        if name in built:
+            return
 
-        with ui.tab_panel("Workspace").classes("w-full items-center"):
-            await write_workspace()
+        built.add(name)
 
-        with ui.tab_panel("Plugins").classes("w-full items-center"):
-            await write_plugins()
+        panel = panels[name]
+        panel.clear()
 
-async def write_store():
-    global applications
-    global grid_applications
+        start = time.perf_counter()
+
+        try:
+            with panel, trace_action(f"tab {name}"):
+                await writers[name]()
+        except Exception:
+            log.exception(f"An exception occurred while building the '{name}' tab")
+
+            # Activating the tab again will retry.
+            built.discard(name)
+
+            panel.clear()
+
+            with panel:
+                write_skeleton()
+
+            my_notify(f"{name}: The tab could not be loaded. Select it again to retry.", "negative")
+        finally:
+            PAGE_RENDER.observe(time.perf_counter() - start, page=f"/ ({name})")
+
+    with ui.tab_panels(tabs, value="Store").classes("w-full items-center") as tab_panels:
+        for name in writers:
+            with ui.tab_panel(name).classes("w-full items-center") as panel:
+                write_skeleton()
+
+            panels[name] = panel
 
+    await build_panel(tab_panels.value)
+
+    tab_panels.on_value_change(lambda e: build_panel(e.value))
+
+def write_skeleton():
+    with ui.column().classes("w-full"):
+        ui.skeleton(height="3em").classes("w-full")
+
+        for _ in range(SKELETON_ROWS):
+            ui.skeleton("text").classes("w-full text-xl")
+
+async def write_store():
     applications = await get_applications()
 
-    search = ui.input(placeholder="Search ...", on_change=add_applications)
+    search = ui.input(placeholder="Search ...",
+        on_change=lambda e: filter_applications(cards, e.sender.value)
+    )
     search.classes("w-full")
+    search.props(f"debounce={SEARCH_DEBOUNCE}")
 
-    grid_applications = ui.grid(columns=1).classes("w-full items-center")
+    with ui.grid(columns=1).classes("w-full items-center"):
+        cards = add_applications(applications)
 
-    add_applications(None)
+def add_applications(applications):
+    cards = []
 
-async def get_applications():
-    result = {}
+    for app_name in applications:
+        application = applications[app_name]
+        projectdir = os.path.join(PROJECTS, app_name.lower())
+        app_image = os.path.join(projectdir, application.get("image", NOIMAGE))
+        app_descr = application.get("description", NODESCR)
+        app_www = application.get("www", NOWWW)
 
-    if not os.path.isdir(PROJECTS):
-        return result
+        with ui.button(app_name, on_click=lambda e, a=app_name: open_dialog(applications, a)) as card:
+            card.props("color=white no-caps")
+            card.tooltip(app_name)
 
-    apps = os.listdir(PROJECTS)
+            if app_image == NOIMAGE \
+                    or not thumbnails_enabled():
+                thumbnail = app_image
+            else:
+                thumbnail = get_thumbnail_url(app_image)
 
-    for app in apps:
-        project = os.path.join(PROJECTS, app)
-        director_file = os.path.join(project, DIRECTOR_FILE)
-        info_file = os.path.join(project, INFO_FILE)
+            if thumbnail is None:
+                image = ui.image(NOIMAGE)
 
-        if not os.path.isfile(info_file):
-            log.warning(f"{project}: The project doesn't have an information file.")
-            continue
+                background_tasks.create(load_thumbnail(image, app_image))
+            else:
+                image = ui.image(thumbnail)
 
-        if not os.path.isfile(director_file):
-            log.warning(f"{project}: The project doesn't have a director file.")
-            continue
+            image.props(f"width={IMAGE_WIDTH}px height={IMAGE_HEIGHT}")
 
-        with open(info_file) as fd:
-            try:
-                info = commentjson.loads(await run.io_bound(fd.read))
-            except:
-                log.exception(f"An exception occurred while parsing 'info.json' of '{app}'")
-                continue
-            
-            appname = info.get("name", app)
+            ui.separator().style("margin-top: 10px")
 
-            result[appname] = info
+            ui.label(app_descr)\
+                .style("color: black")
 
-    return result
+        cards.append((app_name.lower(), card))
 
-def add_applications(e):
-    if e is None:
-        match = None
-    else:
-        match = e.sender.value
+    return cards
 
-    with grid_applications:
-        grid_applications.clear()
+async def load_thumbnail(image, app_image):
+    thumbnail = await make_thumbnail(app_image)
 
-        for app_name in applications:
-            application = applications[app_name]
-            projectdir = os.path.join(PROJECTS, app_name.lower())
-            app_image = os.path.join(projectdir, application.get("image", NOIMAGE))
-            app_descr = application.get("description", NODESCR)
-            app_www = application.get("www", NOWWW)
+    if thumbnail is None:
+        thumbnail = app_image
 
-            if match is not None \
-                and match.lower() not in app_name.lower():
-                    continue
+    image.set_source(thumbnail)
 
-            with ui.button(app_name, on_click=open_dialog).props("color=white no-caps").tooltip(app_name):
-                ui.image(app_image)\
-                    .props(f"width={IMAGE_WIDTH}px height={IMAGE_HEIGHT}")
+def filter_applications(cards, match):
+    if match is None:
+        match = ""
 
-                ui.separator().style("margin-top: 10px")
+    match = match.lower()
 
-                ui.label(app_descr)\
-                    .style("color: black")
+    # Only the cards whose visibility changes are sent to the browser.
+    for (app_name, card) in cards:
+        visible = match in app_name
 
-async def open_dialog(e):
-    appname = e.sender.text
+        if card.visible != visible:
+            card.visible = visible
 
+async def open_dialog(applications, appname):
     info = applications[appname]
     appdir = os.path.join(PROJECTS, appname.lower())
     director_file = os.path.join(appdir, DIRECTOR_FILE)
@@ -181,128 +285,86 @@ async def open_dialog(e):
 
     async def deploy_app(e):
         project = project_name.value
-        workspace = os.path.join(WORKSPACES, project)
-        done_file = os.path.join(workspace, DONE_FILE)
-        inprogress_file = os.path.join(workspace, INPROGRESS_FILE)
 
-        if os.path.isfile(inprogress_file):
+        job = get_active_job(project)
+
+        if job is not None:
             my_notify(
                 f"{project}: The project is currently being deployed.",
                 "warning"
             )
 
-            return
-
-        project_deployed = await run.cpu_bound(check_project, project)
-
-        if project_deployed == 0 \
-                and os.path.isfile(done_file):
-            my_notify(
-                f"{project}: The project already exists!",
-                "negative"
-            )
+            await open_joblog(job)
 
             return
-        elif project_deployed == EX_NOINPUT:
-            pass
-        else:
-            await run.cpu_bound(destroy_project, project, workspace)
-
-        loading_spinner.visible = True
-
-        if os.path.isdir(workspace):
-            shutil.rmtree(workspace)
-
-        shutil.copytree(appdir, workspace,
-            symlinks=True
-        )
-
-        director_file = os.path.join(workspace, DIRECTOR_FILE)
 
-        with open(director_file, "w") as fd:
-            await run.io_bound(fd.write, director_file_code.value)
+        (error, _) = await check_deployment(project)
 
-        env_file = os.path.join(workspace, ENV_FILE)
+        if error is not None:
+            my_notify(error, "negative")
 
-        with open(env_file, "w") as fd:
-            if env_file_code is not None:
-                env_file_content = env_file_code.value
-            else:
-                env_file_content = ""
-
-            await run.io_bound(fd.write, env_file_content)
+            return
 
-        with open(inprogress_file, "w") as fd:
-            await run.io_bound(fd.write, "")
+        files = {
+            DIRECTOR_FILE : director_file_code.value,
+            ENV_FILE : env_file_code.value if env_file_code is not None else ""
+        }
 
         for extra_filename, extra_form in extra_forms.items():
-            extra_outname = os.path.join(workspace, extra_filename)
-
-            with open(extra_outname, "w") as fd:
-                await run.io_bound(fd.write, extra_form.value)
-
-        proc = await run.cpu_bound(deploy_project, project, workspace)
-
-        loading_spinner.visible = False
+            files[extra_filename] = extra_form.value
 
-        if proc.returncode == 0:
-            shutil.move(inprogress_file, done_file)
+        layout = ui.context.client.layout
 
-            my_notify(
-                f"{project}: Deployed!",
-                "positive",
-                timeout=8000
-            )
+        def deploy_done(job):
+            invalidate_projects()
 
-            open_consolelog(proc.stdout, lambda: (dialog.close(), dialog.clear()))
+            with layout:
+                if job.status == JOB_DONE:
+                    my_notify(
+                        f"{project}: Deployed!",
+                        "positive",
+                        timeout=8000
+                    )
+                else:
+                    my_notify(
+                        f"{project}: An error ocurred while deploying the project",
+                        "negative",
+                        timeout=8000
+                    )
 
-            if projects_refreshable is not None:
-                await projects_refreshable(None)
-                projects_refreshable.refresh()
-        else:
-            my_notify(
-                f"{project}: An error ocurred while deploying the project",
-                "negative",
-                timeout=8000
-            )
+        def close_deployed():
+            if job.status == JOB_DONE:
+                dialog.close()
+                dialog.clear()
 
-            open_consolelog(proc.stdout)
+        (job, _) = submit_job("deploy", project,
+            lambda on_output: deploy_workspace(appdir, project, files, on_output),
+            on_done=deploy_done
+        )
 
-            os.remove(inprogress_file)
+        await open_joblog(job, close_deployed)
 
     async def save_template(e):
-        director_file = os.path.join(appdir, DIRECTOR_FILE)
-
-        with open(director_file, "w") as fd:
-            await run.io_bound(fd.write, director_file_code.value)
+        files = {
+            DIRECTOR_FILE : director_file_code.value
+        }
 
         if env_file_code is not None:
-            env_file = os.path.join(appdir, ENV_FILE)
-
-            with open(env_file, "w") as fd:
-                await run.io_bound(fd.write, env_file_code.value)
+            files[ENV_FILE] = env_file_code.value
 
         for extra_filename, extra_form in extra_forms.items():
-            extra_outname = os.path.join(appdir, extra_filename)
+            files[extra_filename] = extra_form.value
 
-            with open(extra_outname, "w") as fd:
-                await run.io_bound(fd.write, extra_form.value)
+        await run.io_bound(write_files, appdir, files)
 
         my_notify("Saved!", "positive")
 
     async def btn_destroy_project(e):
-        shutil.rmtree(appdir)
+        await run.io_bound(shutil.rmtree, appdir)
 
         ui.navigate.reload()
 
     def close_dialog(d):
-        if loading_spinner.visible:
-            my_notify(
-                "There is a project currently being deployed, please wait",
-                "warning"
-            )
-            return
-
         d.close()
         d.clear()
 
@@ -388,107 +450,224 @@ async def open_dialog(e):
                 on_click=btn_destroy_project
             )
 
+async def write_workspace():
+    await get_cached_projects()
+
+    selected = set()
+
+    @ui.refreshable
+    def projects_list():
+        add_workspaces(search.value, selected)
+
+    async def bulk_selected(kind, cmd):
+        projects = get_cached_projects_nowait()
+        targets = [project for project in projects if project in selected]
+
+        if len(targets) == 0:
+            my_notify("No project has been selected.", "warning")
+            return
+
+        selected.clear()
+
+        projects_list.refresh()
+
+        with ui.context.client.layout:
+            await bulk_window(targets, kind, cmd)
+
+    search = ui.input(placeholder="Search ...", on_change=lambda e: projects_list.refresh())
+    search.classes("w-full")
+    search.props(f"debounce={SEARCH_DEBOUNCE}")
+
+    with ui.row():
+        ui.button("Up selected",
+            icon="play_arrow",
+            color="white",
+            on_click=lambda e: bulk_selected("up", deploy_project)
+        )
+
+        ui.button("Down selected",
+            icon="stop",
+            color="white",
+            on_click=lambda e: bulk_selected("down", down_project)
+        )
+
+        ui.button("Destroy selected",
+            icon="delete",
+            color="white",
+            on_click=lambda e: bulk_selected("destroy", destroy_project)
+        )
+
+    projects_list()
+
+    add_projects_listener(ui.context.client, projects_list.refresh)
+
+async def bulk_window(projects, kind, cmd):
+    jobs = {}
+
+    def on_progress(project, state, job):
+        (icon, caption) = rows[project]
+
+        if state == BULK_RUNNING:
+            icon.name = "pending"
+            icon.props("color=yellow")
+        elif state == BULK_DONE:
+            icon.name = "check_circle"
+            icon.props("color=green")
+        elif state == BULK_FAILED:
+            icon.name = "error"
+            icon.props("color=red")
+        elif state == BULK_BUSY:
+            icon.name = "block"
+            icon.props("color=brown")
+        else:
+            icon.name = "schedule"
+            icon.props("color=blue")
+
+        caption.text = state
+
+        if job is not None:
+            jobs[project] = job
+
+    async def open_output(project):
+        job = jobs.get(project)
+
+        if job is None:
+            my_notify(f"{project}: The project has not been submitted yet.", "warning")
+            return
+
+        with ui.context.client.layout:
+            await open_joblog(job)
+
+    with ui.dialog() as dialog, ui.card().classes("w-10/12 h-4/6"):
+        dialog.props("persistent")
+        dialog.open()
+
+        ui.label(f"{kind}:").props("header").classes("text-bold")
+
+        rows = {}
+
+        with ui.scroll_area().classes("w-full h-full border-2"):
+            with ui.list().classes("w-full"):
+                for project in projects:
+                    with ui.item(on_click=lambda e, p=project: open_output(p)):
+                        with ui.item_section().props("avatar"):
+                            icon = ui.icon("schedule", color="blue")
+
+                        with ui.item_section():
+                            ui.item_label(project)
+
+                            caption = ui.item_label().props("caption")
+
+                    rows[project] = (icon, caption)
+
+        with ui.row().classes("items-center"):
+            close_button = ui.button("Close",
+                icon="close",
+                color="white",
+                on_click=lambda e: (dialog.close(), dialog.clear())
+            )
+            close_button.disable()
+
             loading_spinner = ui.spinner("tail",
                 color="black",
                 size="2em"
             )
 
-            loading_spinner.visible = False
+    with trace_action(f"bulk {kind}"):
+        await run_bulk(kind, projects, cmd, on_progress)
 
-async def write_workspace():
-    global grid_projects
-    global projects_refreshable
+    invalidate_projects()
 
-    search = ui.input(placeholder="Search ...", on_change=add_workspaces)
-    search.classes("w-full")
-
-    grid_projects = ui.grid(columns=1).classes("w-full border-2")
+    close_button.enable()
+    loading_spinner.visible = False
 
-    projects_refreshable = ui.refreshable(add_workspaces)
-    await projects_refreshable(None)
+def add_workspaces(match, selected):
+    projects = get_cached_projects_nowait()
 
-async def add_workspaces(e):
-    if e is None:
-        match = None
-    else:
-        match = e.sender.value
-
-    projects = await run.cpu_bound(get_projects)
+    def select_project(project, value):
+        if value:
+            selected.add(project)
+        else:
+            selected.discard(project)
 
     async def up_project_window(project):
         await project_window(
             project,
+            "up",
             deploy_project
         )
 
     async def down_project_window(project):
         await project_window(
             project,
+            "down",
             down_project
         )
 
     async def destroy_project_window(project):
         await project_window(
             project,
+            "destroy",
             destroy_project
         )
 
     async def destroy_workspace_window(project):
         await project_window(
             project,
+            "destroy workspace",
             destroy_workspace
         )
 
-    async def project_window(project, cmd):
+    async def project_window(project, kind, cmd):
         workspace = os.path.join(WORKSPACES, project)
 
-        proc = await run.cpu_bound(cmd, project, workspace)
+        (job, created) = submit_job(kind, project,
+            lambda on_output: cmd(project, workspace, on_output),
+            JOB_PRIORITY_HIGH,
+            on_done=lambda job: invalidate_projects()
+        )
 
-        await projects_refreshable(None)
-        projects_refreshable.refresh()
+        if not created:
+            my_notify(
+                f"{project}: There is already a pending job for this project.",
+                "warning"
+            )
+
+        with ui.context.client.layout:
+            await open_joblog(job)
 
     async def logs_window(project):
-        chk = await run.cpu_bound(check_project, project)
+        with trace_action("logs"):
+            info = await describe_project(project)
 
-        if chk == EX_NOINPUT:
+        if info is None \
+                or info.get("last_log") is None:
             my_notify(
                 f"{project}: It has not been possible to read the log of this project",
                 "warning"
             )
             return
 
-        info = get_project_info(project)
         last_log = info["last_log"]
 
-        await listfiles_window(last_log)
-
-    with grid_projects:
-        grid_projects.clear()
+        with ui.context.client.layout:
+            await listfiles_window(last_log)
 
+    with ui.grid(columns=1).classes("w-full border-2"):
         for name in projects:
             if match is not None \
                 and match.lower() not in name.lower():
                     continue
 
-            status = projects[name]
+            status = PROJECT_STATUSES.get(projects[name], "UNKNOWN")
+            color = PROJECT_STATUS_COLORS[status]
 
-            if status == "+":
-                status = "DONE"
-                color = "green"
-            elif status == "-":
-                status = "FAILED"
-                color = "red"
-            elif status == "!":
-                status = "UNFINISHED"
-                color = "brown"
-            elif status == "x":
-                status = "DESTROYING"
-                color = "yellow"
-            else:
-                status = "UNKNOWN"
-                color = "blue"
+            with ui.row().classes("w-full pt-3 pl-3 pr-3 pb-3 items-center"):
+                ui.checkbox(
+                    value=name in selected,
+                    on_change=lambda e, p=name: select_project(p, e.value)
+                )
 
-            with ui.row().classes("w-full pt-3 pl-3 pr-3 pb-3"):
                 status_icon = ui.icon("circle",
                     color=color
                 )
@@ -537,59 +716,287 @@ async def add_workspaces(e):
     if len(projects) == 0:
         ui.label("No project has been created ...").classes("text-lg italic")
 
-async def write_plugins():
-    os.makedirs(PLUGINS, exist_ok=True)
+async def write_jails():
+    jails = await get_cached_jails()
 
-    plugins = os.listdir(PLUGINS)
+    rows = {}
 
-    if len(plugins) == 0:
-        ui.label("No plugin has been added ...").classes("text-lg italic")
-        return
+    def set_status(status_icon, status):
+        if status == "UP":
+            status_icon.props("color=green")
+        else:
+            status_icon.props("color=red")
 
-    with ui.list().classes("w-full"):
-        for plugin in plugins:
-            (plugin_name, _) = os.path.splitext(plugin)
+    def add_jail(name, attrs):
+        with jails_list:
+            with ui.row().classes("w-full pt-3 pl-3 pr-3 pb-3 items-center") as row:
+                status_icon = ui.icon("circle")
+                status_icon.classes("text-2xl")
+
+                set_status(status_icon, attrs.get("status"))
+
+                ui.label(name).classes("text-xl w-1/6")
+
+                labels = {}
+
+                for keyword in JAILS_KEYWORDS[1:]:
+                    labels[keyword] = ui.label(attrs.get(keyword, "-")).classes("w-1/12")
+
+                with ui.row().classes("ml-auto"):
+                    for (icon, tooltip, cmd) in (
+                        ("play_arrow", "start", start_jail),
+                        ("stop", "stop", stop_jail),
+                        ("restart_alt", "restart", restart_jail),
+                        ("delete", "destroy", destroy_jail)
+                    ):
+                        with ui.button(on_click=lambda e, j=name, c=cmd: jail_action(j, c)) as button:
+                            button.classes("p-0")
+                            button.props("flat")
+                            button.tooltip(tooltip)
+
+                            ui.icon(icon, color="black")
+
+        rows[name] = (row, status_icon, labels)
 
-            plugin_file = os.path.join(PLUGINS, f"{plugin_name}.py")
+    def update_jails(changed, removed):
+        for name in removed:
+            (row, _, _) = rows.pop(name)
 
-            if not os.path.isfile(plugin_file):
+            jails_list.remove(row)
+
+        # Only the labels whose value changed are sent to the browser.
+        for (name, attrs) in changed.items():
+            if name not in rows:
+                add_jail(name, attrs)
                 continue
 
-            mod_name = "appjail_gui.plugins.%s" % plugin_name
-            spec = importlib.util.spec_from_file_location(
-                mod_name,
-                plugin_file
+            (_, status_icon, labels) = rows[name]
+
+            set_status(status_icon, attrs.get("status"))
+
+            for (keyword, label) in labels.items():
+                label.text = attrs.get(keyword, "-")
+
+        no_jails.visible = len(rows) == 0
+
+    async def jail_action(jail, cmd):
+        with trace_action(f"jail {cmd.__name__}"):
+            proc = await cmd(jail)
+
+        if proc.returncode != 0:
+            my_notify(
+                f"{jail}: The command returned a non-zero exit status.",
+                "negative"
             )
-            mod = importlib.util.module_from_spec(spec)
-            sys.modules[mod_name] = mod
-            spec.loader.exec_module(mod)
 
-            chk_attr_main = hasattr(mod, "main")
-            chk_attr_descr = hasattr(mod, "descr")
+            open_consolelog(proc.stdout)
+
+        invalidate_jails()
 
-            if not chk_attr_main:
-                log.warning(f"Plugin '{plugin_file}' doesn't have the 'main' function.")
-                continue
+    jails_list = ui.column().classes("w-full border-2")
 
-            if not chk_attr_descr:
-                log.warning(f"Plugin '{plugin_file}' doesn't have the 'descr' attribute.")
-                continue
+    with jails_list:
+        no_jails = ui.label("No jail has been created ...").classes("text-lg italic")
 
-            with ui.item(on_click=mod.main).classes("border-2"):
+    for (name, attrs) in jails.items():
+        add_jail(name, attrs)
+
+    no_jails.visible = len(rows) == 0
+
+    add_jails_listener(ui.context.client, update_jails)
+
+async def write_jobs():
+    @ui.refreshable
+    def jobs_list():
+        add_jobs()
+
+    jobs_list()
+
+    add_jobs_listener(ui.context.client, lambda job: jobs_list.refresh())
+
+def add_jobs():
+    jobs = get_jobs()
+
+    # The list is rebuilt on every change of a job, so the log is opened
+    # outside of it.
+    async def job_window(job):
+        with ui.context.client.layout:
+            await open_joblog(job)
+
+    if len(jobs) == 0:
+        ui.label("No job has been queued ...").classes("text-lg italic")
+        return
+
+    with ui.list().classes("w-full"):
+        for job in reversed(jobs):
+            if job.status == JOB_DONE:
+                color = "green"
+            elif job.status == JOB_FAILED:
+                color = "red"
+            elif job.status == JOB_RUNNING:
+                color = "yellow"
+            elif job.status == JOB_QUEUED:
+                color = "blue"
+            else:
+                color = "brown"
+
+            created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(job.created))
+
+            with ui.item(on_click=lambda e, j=job: job_window(j)).classes("border-2"):
+                with ui.item_section().props("avatar"):
+                    status_icon = ui.icon("circle",
+                        color=color
+                    )
+                    status_icon.tooltip(job.status.upper())
+
+                with ui.item_section():
+                    ui.item_label(job.project).classes("text-bold")
+                    ui.item_label(job.kind).props("caption")
+
+                with ui.item_section().props("side"):
+                    ui.item_label(created).props("caption")
+
+async def write_plugins():
+    plugins = await run.io_bound(scan_plugins)
+
+    if len(plugins) == 0:
+        ui.label("No plugin has been added ...").classes("text-lg italic")
+        return
+
+    with ui.list().classes("w-full"):
+        for (plugin_name, plugin) in plugins.items():
+            with ui.item(on_click=lambda e, p=plugin_name: run_plugin(p, e)).classes("border-2"):
                 with ui.row():
                     ui.label(f"{plugin_name}:").props("header").classes("text-bold")
 
-                    ui.label(mod.descr)
+                    ui.label(plugin["descr"])
+
+def run_plugin(plugin_name, e):
+    try:
+        mod = load_plugin(plugin_name)
+    except Exception:
+        log.exception(f"An exception occurred while loading the plugin '{plugin_name}'")
+
+        my_notify(f"{plugin_name}: The plugin could not be loaded.", "negative")
+        return
+
+    if not hasattr(mod, "main"):
+        log.warning(f"Plugin '{plugin_name}' doesn't have the 'main' function.")
+        return
+
+    with trace_action(f"plugin {plugin_name}"):
+        handle_event(mod.main, e)
+
+@ui.page("/admin/commands", title=PAGE_TITLE, favicon=PAGE_FAVICON)
+def admin_commands(top: int = TRACES_TOP):
+    with ui.card().classes("w-full"):
+        ui.label("Slowest commands:").props("header").classes("text-bold")
+
+        ui.table(
+            columns=[
+                { "name" : "duration", "label" : "Duration (s)", "field" : "duration", "align" : "right" },
+                { "name" : "command", "label" : "Command", "field" : "command", "align" : "left" },
+                { "name" : "cwd", "label" : "Directory", "field" : "cwd", "align" : "left" },
+                { "name" : "action", "label" : "Action", "field" : "action", "align" : "left" },
+                { "name" : "started", "label" : "Started", "field" : "started", "align" : "left" },
+                { "name" : "returncode", "label" : "Exit", "field" : "returncode", "align" : "right" },
+                { "name" : "output_bytes", "label" : "Output", "field" : "output_bytes", "align" : "right" }
+            ],
+            rows=[
+                {
+                    **trace,
+                    "duration" : f"{trace['duration']:.3f}",
+                    "started" : format_started(trace["started"]),
+                    "output_bytes" : format_size(trace["output_bytes"])
+                } for trace in slowest_commands(top)
+            ]
+        ).classes("w-full")
+
+    for (title, key, label, entries) in (
+        ("Most frequent commands:", "label", "Command", frequent_commands(top)),
+        ("Commands spawned by action:", "action", "Action", action_fanout(top))
+    ):
+        with ui.card().classes("w-full"):
+            ui.label(title).props("header").classes("text-bold")
+
+            ui.table(
+                columns=[
+                    { "name" : key, "label" : label, "field" : key, "align" : "left" },
+                    { "name" : "count", "label" : "Spawns", "field" : "count", "align" : "right" },
+                    { "name" : "total", "label" : "Total (s)", "field" : "total", "align" : "right" },
+                    { "name" : "max", "label" : "Max (s)", "field" : "max", "align" : "right" },
+                    { "name" : "output_bytes", "label" : "Output", "field" : "output_bytes", "align" : "right" }
+                ],
+                rows=[
+                    {
+                        **entry,
+                        "total" : f"{entry['total']:.3f}",
+                        "max" : f"{entry['max']:.3f}",
+                        "output_bytes" : format_size(entry["output_bytes"])
+                    } for entry in entries
+                ]
+            ).classes("w-full")
+
+@ui.page("/admin/stalls", title=PAGE_TITLE, favicon=PAGE_FAVICON)
+def admin_stalls():
+    if not watchdog_enabled():
+        ui.label("The watchdog is disabled. Start appjail-gui with --watchdog to enable it.")\
+            .classes("text-lg italic")
+        return
+
+    with ui.card().classes("w-full"):
+        ui.label("Offenders:").props("header").classes("text-bold")
+
+        ui.table(
+            columns=[
+                { "name" : "site", "label" : "Site", "field" : "site", "align" : "left" },
+                { "name" : "count", "label" : "Stalls", "field" : "count", "align" : "right" },
+                { "name" : "total", "label" : "Total (s)", "field" : "total", "align" : "right" },
+                { "name" : "max", "label" : "Max (s)", "field" : "max", "align" : "right" }
+            ],
+            rows=[
+                {
+                    **offender,
+                    "total" : f"{offender['total']:.3f}",
+                    "max" : f"{offender['max']:.3f}"
+                } for offender in get_offenders()
+            ]
+        ).classes("w-full")
+
+    with ui.card().classes("w-full"):
+        ui.label("Recent stalls:").props("header").classes("text-bold")
+
+        stalls = get_stalls()
+
+        for stall in stalls:
+            with ui.expansion(
+                "%s, %.3fs, %s" % (format_started(stall["started"]), stall["lag"], stall["site"])
+            ).classes("w-full border-2"):
+                ui.code(stall["stack"], language="python").classes("w-full")
+
+        if len(stalls) == 0:
+            ui.label("The event loop has not been blocked yet ...").classes("text-lg italic")
 
 @app.exception_handler(500)
 @app.exception_handler(404)
 async def exception_handler(request, exc):
-    with Client(page(""), request=request) as client:
-        if isinstance(exc, starlette.exceptions.HTTPException):
-            status_code = exc.status_code
-        else:
-            status_code = 500
+    if isinstance(exc, starlette.exceptions.HTTPException):
+        status_code = exc.status_code
+    else:
+        status_code = 500
+
+    if isinstance(exc, str):
+        message = exc
+    else:
+        message = exc.__class__.__name__
+        if str(exc):
+            message += ': ' + str(exc)
+
+    # Scripts using the API expect JSON, not a page.
+    if request.url.path.startswith(API_ROUTE + "/"):
+        return api_error(status_code, message)
 
+    with Client(page(""), request=request) as client:
         if 400 <= status_code <= 499:
             title = "This page doesn't exist."
         elif 500 <= status_code <= 599:
@@ -597,13 +1004,6 @@ async def exception_handler(request, exc):
         else:
             title = 'Unknown error'
 
-        if isinstance(exc, str):
-            message = exc
-        else:
-            message = exc.__class__.__name__
-            if str(exc):
-                message += ': ' + str(exc)
-
         with ui.dialog() as dialog, ui.card(align_items="center").classes("w-full h-4/5"):
             dialog.open()
             dialog.props("persist")
@@ -618,6 +1018,13 @@ async def exception_handler(request, exc):
 
         return client.build_response(request, status_code)
 
+app.on_startup(start_projects_poller)
+app.on_startup(scan_plugins)
+app.on_startup(start_job_workers)
+app.on_startup(start_jails_collector)
+app.on_startup(start_loop_lag_probe)
+app.on_startup(start_watchdog)
+
 def cli():
     try:
         ui.run(
@@ -0,0 +1,312 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import hmac
+import json
+import os
+import re
+import urllib.parse
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from nicegui import app, run
+
+from appjail_gui.tools.catalog import get_applications
+from appjail_gui.tools.constants import API_TOKEN
+from appjail_gui.tools.constants import DIRECTOR_FILE
+from appjail_gui.tools.constants import ENV_FILE
+from appjail_gui.tools.constants import PROJECTS
+from appjail_gui.tools.constants import WORKSPACES
+from appjail_gui.tools.deploy import check_deployment
+from appjail_gui.tools.deploy import deploy_workspace
+from appjail_gui.tools.director import describe_project
+from appjail_gui.tools.director import destroy_project
+from appjail_gui.tools.director import deploy_project
+from appjail_gui.tools.director import down_project
+from appjail_gui.tools.files import list_logfiles
+from appjail_gui.tools.jails import get_current_jails
+from appjail_gui.tools.jobs import get_job
+from appjail_gui.tools.jobs import get_jobs
+from appjail_gui.tools.jobs import submit_job
+from appjail_gui.tools.projects import get_cached_projects
+from appjail_gui.tools.projects import invalidate_projects
+from appjail_gui.tools.projects import PROJECT_STATUSES
+from appjail_gui.tools.tail import follow_file
+from appjail_gui.tools.tail import follow_job
+from appjail_gui.tools.tail import stream_events
+
+API_ROUTE = "/api"
+PROJECT_NAME_PATTERN = r"^[a-zA-Z0-9._-]+$"
+PROJECT_COMMANDS = {
+    "up" : deploy_project,
+    "down" : down_project,
+    "destroy" : destroy_project
+}
+
+def api_error(status_code, message):
+    return JSONResponse({ "error" : message }, status_code=status_code)
+
+def event_stream(events):
+    return StreamingResponse(events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control" : "no-cache",
+            "X-Accel-Buffering" : "no"
+        }
+    )
+
+def check_request(request):
+    # A JSON body can't be sent cross-site without a preflight, so together
+    # with the Origin check this keeps other sites from running commands.
+    content_type = request.headers.get("content-type", "")
+
+    if content_type.split(";")[0].strip().lower() != "application/json":
+        return api_error(415, "The Content-Type must be 'application/json'.")
+
+    origin = request.headers.get("origin")
+
+    if origin is not None \
+            and urllib.parse.urlsplit(origin).netloc != request.headers.get("host"):
+        return api_error(403, f"{origin}: Origin not allowed.")
+
+    if API_TOKEN is not None:
+        authorization = request.headers.get("authorization", "")
+
+        if not hmac.compare_digest(authorization.encode(), f"Bearer {API_TOKEN}".encode()):
+            return api_error(401, "Invalid or missing API token.")
+
+    return None
+
+async def get_last_log(project):
+    if re.match(PROJECT_NAME_PATTERN, project) is None:
+        return None
+
+    info = await describe_project(project)
+
+    if info is None:
+        return None
+
+    return info.get("last_log")
+
+def job_response(job, created):
+    return JSONResponse({ **job.to_dict(), "submitted" : created },
+        status_code=202 if created else 409
+    )
+
+@app.get(API_ROUTE + "/applications")
+async def api_applications():
+    return dict(await get_applications())
+
+@app.get(API_ROUTE + "/projects")
+async def api_projects():
+    projects = await get_cached_projects()
+
+    return {
+        project : PROJECT_STATUSES.get(status, "UNKNOWN") for (project, status) in projects.items()
+    }
+
+@app.get(API_ROUTE + "/projects/{project}")
+async def api_project(project: str):
+    if re.match(PROJECT_NAME_PATTERN, project) is None:
+        return api_error(400, "Invalid project name.")
+
+    info = await describe_project(project)
+
+    if info is None:
+        return api_error(404, f"{project}: The project could not be described.")
+
+    return info
+
+@app.get(API_ROUTE + "/projects/{project}/logs")
+async def api_project_logs(project: str):
+    last_log = await get_last_log(project)
+
+    if last_log is None:
+        return api_error(404, f"{project}: It has not been possible to read the log of this project.")
+
+    files = await run.io_bound(list_logfiles, last_log)
+
+    return [
+        {
+            "name" : os.path.relpath(pathname, last_log),
+            "size" : size,
+            "mtime" : mtime
+        } for (_, pathname, size, mtime) in files
+    ]
+
+@app.get(API_ROUTE + "/projects/{project}/logs/{name:path}")
+async def api_project_log(project: str, name: str):
+    last_log = await get_last_log(project)
+
+    if last_log is None:
+        return api_error(404, f"{project}: It has not been possible to read the log of this project.")
+
+    last_log = os.path.realpath(last_log)
+    pathname = os.path.realpath(os.path.join(last_log, name))
+
+    if os.path.commonpath((last_log, pathname)) != last_log \
+            or not os.path.isfile(pathname):
+        return api_error(404, f"{name}: Log not found.")
+
+    (watcher, subscriber) = follow_file(pathname)
+
+    async def events():
+        try:
+            async for event in stream_events(subscriber):
+                yield event
+        finally:
+            watcher.unsubscribe(subscriber)
+
+    return event_stream(events())
+
+@app.post(API_ROUTE + "/projects/{project}/{command}")
+async def api_project_command(project: str, command: str, request: Request):
+    error = check_request(request)
+
+    if error is not None:
+        return error
+
+    cmd = PROJECT_COMMANDS.get(command)
+
+    if cmd is None:
+        return api_error(404, f"{command}: Invalid command.")
+
+    if re.match(PROJECT_NAME_PATTERN, project) is None:
+        return api_error(400, "Invalid project name.")
+
+    workspace = os.path.join(WORKSPACES, project)
+
+    if not os.path.isdir(workspace):
+        return api_error(404, f"{project}: The project doesn't have a workspace.")
+
+    (job, created) = submit_job(command, project,
+        lambda on_output: cmd(project, workspace, on_output),
+        on_done=lambda job: invalidate_projects()
+    )
+
+    return job_response(job, created)
+
+@app.post(API_ROUTE + "/applications/{appname}/deploy")
+async def api_deploy(appname: str, request: Request):
+    error = check_request(request)
+
+    if error is not None:
+        return error
+
+    applications = await get_applications()
+
+    if appname not in applications:
+        return api_error(404, f"{appname}: Application not found.")
+
+    body = await request.body()
+
+    try:
+        body = json.loads(body) if len(body) > 0 else {}
+    except ValueError:
+        return api_error(400, "The body is not valid JSON.")
+
+    if not isinstance(body, dict):
+        return api_error(400, "The body must be a JSON object.")
+
+    project = body.get("project", appname)
+
+    if not isinstance(project, str) \
+            or re.match(PROJECT_NAME_PATTERN, project) is None:
+        return api_error(400, "Invalid project name.")
+
+    # Only the files that can be edited from the Store can be replaced.
+    editable = { DIRECTOR_FILE, ENV_FILE }
+
+    for (name, extra_file) in (applications[appname].get("extra-files") or {}).items():
+        editable.add(extra_file.get("filename", name))
+
+    files = body.get("files", {})
+
+    if not isinstance(files, dict) \
+            or not all(isinstance(content, str) for content in files.values()):
+        return api_error(400, "'files' must map filenames to their content.")
+
+    for filename in files:
+        if filename not in editable:
+            return api_error(400, f"{filename}: The file can't be replaced.")
+
+    (error, _) = await check_deployment(project)
+
+    if error is not None:
+        return api_error(409, error)
+
+    appdir = os.path.join(PROJECTS, appname.lower())
+
+    (job, created) = submit_job("deploy", project,
+        lambda on_output: deploy_workspace(appdir, project, files, on_output),
+        on_done=lambda job: invalidate_projects()
+    )
+
+    return job_response(job, created)
+
+@app.get(API_ROUTE + "/jails")
+async def api_jails():
+    return await get_current_jails()
+
+@app.get(API_ROUTE + "/jobs")
+async def api_jobs():
+    return [job.to_dict() for job in get_jobs()]
+
+@app.get(API_ROUTE + "/jobs/{job_id}")
+async def api_job(job_id: str, lines: int = 0):
+    job = get_job(job_id)
+
+    if job is None:
+        return api_error(404, f"{job_id}: Job not found.")
+
+    response = job.to_dict()
+
+    if lines > 0:
+        response["output"] = list(await job.get_output())[-lines:]
+
+    return response
+
+@app.get(API_ROUTE + "/jobs/{job_id}/stream")
+async def api_job_stream(job_id: str):
+    job = get_job(job_id)
+
+    if job is None:
+        return api_error(404, f"{job_id}: Job not found.")
+
+    (subscriber, callback) = await follow_job(job)
+
+    async def events():
+        try:
+            async for event in stream_events(subscriber):
+                yield event
+        finally:
+            if callback is not None:
+                job.listeners.remove(callback)
+
+    return event_stream(events())
@@ -29,9 +29,7 @@
 
 import subprocess
 
-from nicegui import run
-
-from appjail_gui.tools.process import run_proc
+from appjail_gui.tools.process import run_proc_async
 
 async def start_jail(jail):
     cmd = [
@@ -41,7 +39,7 @@ async def start_jail(jail):
         jail
     ]
 
-    proc = await run.cpu_bound(run_proc, cmd)
+    proc = await run_proc_async(cmd)
 
     return proc
 
@@ -53,7 +51,7 @@ async def stop_jail(jail):
         jail
     ]
 
-    proc = await run.cpu_bound(run_proc, cmd)
+    proc = await run_proc_async(cmd)
 
     return proc
 
@@ -64,7 +62,7 @@ async def restart_jail(jail):
         jail
     ]
 
-    proc = await run.cpu_bound(run_proc, cmd)
+    proc = await run_proc_async(cmd)
 
     return proc
 
@@ -77,7 +75,7 @@ async def destroy_jail(jail):
         jail
     ]
 
-    proc = await run.cpu_bound(run_proc, cmd)
+    proc = await run_proc_async(cmd)
 
     return proc
 
@@ -89,17 +87,65 @@ async def status_jail(jail):
         jail
     ]
 
-    proc = await run.cpu_bound(run_proc, cmd, stderr=subprocess.DEVNULL)
+    proc = await run_proc_async(cmd, stderr=subprocess.DEVNULL)
 
     return proc.returncode
 
+# Keywords that `appjail jail list` can display as columns. Anything else
+# must be fetched one by one using `appjail jail get`.
+JAIL_LIST_KEYWORDS = (
+    "alt_name",
+    "arch",
+    "boot",
+    "container",
+    "container_boot",
+    "container_image",
+    "container_pid",
+    "created",
+    "devfs_ruleset",
+    "dirty",
+    "hostname",
+    "inet",
+    "inet6",
+    "ip4",
+    "ip6",
+    "is_container",
+    "locked",
+    "name",
+    "network_ip4",
+    "networks",
+    "path",
+    "priority",
+    "ports",
+    "release_name",
+    "status",
+    "type",
+    "version",
+    "version_extra"
+)
+
 async def get_jails(keywords):
-    jails = await run.cpu_bound(list_jails)
+    listable = [keyword for keyword in keywords if keyword in JAIL_LIST_KEYWORDS]
+    columns = await list_jails_columns(listable)
 
     table = []
 
-    for jail in jails:
-        attrs = await get_jail(jail, keywords)
+    for (jail, values) in columns.items():
+        attrs = {}
+
+        for keyword in keywords:
+            if keyword == "name":
+                value = jail
+            elif values is not None \
+                    and keyword in values:
+                value = values[keyword]
+            else:
+                value = await get_jail_attr(jail, keyword)
+
+            if value == "":
+                continue
+
+            attrs[keyword] = value
 
         table.append(attrs)
 
@@ -112,7 +158,7 @@ async def get_jail(jail, keywords):
         if keyword == "name":
             value = jail
         else:
-            value = await run.cpu_bound(get_jail_attr, jail, keyword)
+            value = await get_jail_attr(jail, keyword)
 
         if value == "":
             continue
@@ -121,19 +167,49 @@ async def get_jail(jail, keywords):
 
     return attrs
 
-def list_jails():
+async def list_jails():
     cmd = ["appjail", "jail", "list", "-eHIpt", "name"]
 
-    jails_proc = run_proc(cmd, stderr=subprocess.DEVNULL)
+    jails_proc = await run_proc_async(cmd, stderr=subprocess.DEVNULL)
     jails = jails_proc.stdout
     jails = jails.splitlines()
 
     return jails
 
-def get_jail_attr(jail, attr):
+async def list_jails_columns(keywords):
+    keywords = [keyword for keyword in keywords if keyword != "name"]
+
+    cmd = ["appjail", "jail", "list", "-eHIpt", "name"]
+    cmd.extend(keywords)
+
+    jails_proc = await run_proc_async(cmd, stderr=subprocess.DEVNULL)
+
+    return parse_jails_columns(jails_proc.stdout, keywords)
+
+def parse_jails_columns(output, keywords):
+    columns = {}
+
+    for line in output.splitlines():
+        values = [value.strip() for value in line.split("\t")]
+
+        jail = values.pop(0)
+
+        if jail == "":
+            continue
+
+        # Rows that cannot be parsed are marked with None, so the caller
+        # can fall back to `appjail jail get` for each attribute.
+        if len(values) != len(keywords):
+            columns[jail] = None
+        else:
+            columns[jail] = dict(zip(keywords, values))
+
+    return columns
+
+async def get_jail_attr(jail, attr):
     cmd = ["appjail", "jail", "get", jail, attr]
 
-    value = run_proc(cmd, stderr=subprocess.DEVNULL)
+    value = await run_proc_async(cmd, stderr=subprocess.DEVNULL)
     value = value.stdout
 
     return value.strip()
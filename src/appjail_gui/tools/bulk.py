@@ -0,0 +1,88 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import os
+
+from appjail_gui.tools.constants import BULK_LIMIT
+from appjail_gui.tools.constants import WORKSPACES
+from appjail_gui.tools.jobs import JOB_DONE
+from appjail_gui.tools.jobs import JOB_PRIORITY_LOW
+from appjail_gui.tools.jobs import JOB_RUNNING
+from appjail_gui.tools.jobs import submit_job
+
+BULK_QUEUED = "queued"
+BULK_RUNNING = "running"
+BULK_DONE = "done"
+BULK_FAILED = "failed"
+BULK_BUSY = "busy"
+
+async def run_bulk(kind, projects, cmd, on_progress):
+    semaphore = asyncio.Semaphore(BULK_LIMIT)
+
+    async def run_project(project):
+        # Projects are submitted as jobs a few at a time, so a bulk action
+        # doesn't fill the queue in front of the jobs of other users.
+        async with semaphore:
+            workspace = os.path.join(WORKSPACES, project)
+
+            finished = asyncio.Event()
+
+            def on_job_event(job, line):
+                if line is not None:
+                    return
+
+                if job.status == JOB_RUNNING:
+                    on_progress(project, BULK_RUNNING, job)
+                elif not job.is_active():
+                    on_progress(project, BULK_DONE if job.status == JOB_DONE else BULK_FAILED, job)
+
+                    finished.set()
+
+            (job, created) = submit_job(kind, project,
+                lambda on_output: cmd(project, workspace, on_output),
+                JOB_PRIORITY_LOW
+            )
+
+            # Don't run two commands on the same project at the same time.
+            if not created:
+                on_progress(project, BULK_BUSY, job)
+                return
+
+            job.listeners.add(None, on_job_event)
+
+            try:
+                await finished.wait()
+            finally:
+                job.listeners.remove(on_job_event)
+
+    for project in projects:
+        on_progress(project, BULK_QUEUED, None)
+
+    await asyncio.gather(*(run_project(project) for project in projects))
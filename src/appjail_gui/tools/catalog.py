@@ -0,0 +1,183 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import json
+import os
+import tempfile
+import types
+
+import commentjson
+
+from nicegui import run
+from nicegui.logging import log
+
+from appjail_gui.tools.constants import CACHEDIR
+from appjail_gui.tools.constants import CATALOG_INDEX
+from appjail_gui.tools.constants import DIRECTOR_FILE
+from appjail_gui.tools.constants import INFO_FILE
+from appjail_gui.tools.constants import PROJECTS
+
+CATALOG_VERSION = 1
+
+_index = None
+_snapshot = None
+_catalog_lock = asyncio.Lock()
+
+async def get_applications():
+    global _snapshot
+
+    async with _catalog_lock:
+        applications = await run.io_bound(revalidate_catalog)
+
+        if applications is not None:
+            _snapshot = types.MappingProxyType(applications)
+
+    return _snapshot
+
+def get_catalog_size():
+    if _snapshot is None:
+        return 0
+
+    return len(_snapshot)
+
+def revalidate_catalog():
+    global _index
+
+    # The first call has to build the snapshot even if the index on disk
+    # is up to date.
+    loaded = _index is None
+
+    if loaded:
+        _index = load_index()
+
+    changed = False
+
+    if not os.path.isdir(PROJECTS):
+        apps = []
+    else:
+        apps = os.listdir(PROJECTS)
+
+    index = {}
+
+    for app in apps:
+        project = os.path.join(PROJECTS, app)
+        director_file = os.path.join(project, DIRECTOR_FILE)
+        info_file = os.path.join(project, INFO_FILE)
+
+        try:
+            info_stat = os.stat(info_file)
+        except (FileNotFoundError, NotADirectoryError):
+            log.warning(f"{project}: The project doesn't have an information file.")
+            continue
+
+        if not os.path.isfile(director_file):
+            log.warning(f"{project}: The project doesn't have a director file.")
+            continue
+
+        entry = _index.get(app)
+
+        if entry is None \
+                or entry["mtime"] != info_stat.st_mtime_ns \
+                or entry["size"] != info_stat.st_size:
+            entry = {
+                "mtime" : info_stat.st_mtime_ns,
+                "size" : info_stat.st_size,
+                "info" : parse_info(app, info_file)
+            }
+
+            changed = True
+
+        index[app] = entry
+
+    if index.keys() != _index.keys():
+        changed = True
+
+    _index = index
+
+    if changed:
+        save_index(index)
+    elif not loaded:
+        return
+
+    applications = {}
+
+    for (app, entry) in index.items():
+        info = entry["info"]
+
+        if info is None:
+            continue
+
+        appname = info.get("name", app)
+
+        applications[appname] = info
+
+    return applications
+
+def parse_info(app, info_file):
+    with open(info_file) as fd:
+        try:
+            return commentjson.loads(fd.read())
+        except:
+            log.exception(f"An exception occurred while parsing 'info.json' of '{app}'")
+
+def load_index():
+    try:
+        with open(CATALOG_INDEX) as fd:
+            index = json.load(fd)
+    except FileNotFoundError:
+        return {}
+    except:
+        log.exception(f"{CATALOG_INDEX}: An exception occurred while loading the catalog index")
+        return {}
+
+    if not isinstance(index, dict) \
+            or index.get("version") != CATALOG_VERSION:
+        return {}
+
+    return index.get("projects", {})
+
+def save_index(index):
+    os.makedirs(CACHEDIR, exist_ok=True)
+
+    (fd, tmpname) = tempfile.mkstemp(dir=CACHEDIR, prefix=".catalog-")
+
+    try:
+        with os.fdopen(fd, "w") as fd:
+            json.dump({
+                "version" : CATALOG_VERSION,
+                "projects" : index
+            }, fd)
+
+        os.replace(tmpname, CATALOG_INDEX)
+    except:
+        log.exception(f"{CATALOG_INDEX}: An exception occurred while saving the catalog index")
+
+        if os.path.exists(tmpname):
+            os.remove(tmpname)
@@ -35,6 +35,7 @@ from appjail_gui import dummy
 _homedir = os.getenv("HOME", "/tmp")
 _datadir = os.path.join(_homedir, ".appjail-gui")
 _rootdir = os.path.dirname(dummy.__file__)
+_cachedir = os.path.join(_datadir, "cache")
 
 _parser = argparse.ArgumentParser(
     description="Graphical User Interface for AppJail"
@@ -55,6 +56,59 @@ _parser.add_argument("--workspaces-dir",
     default=os.path.join(_datadir, "data/workspaces"),
     help="location of workspaces"
 )
+_parser.add_argument("--director-projects-dir",
+    default=os.path.join(_homedir, ".director/projects"),
+    help="location of the state files of appjail-director"
+)
+_parser.add_argument("--max-procs",
+    default=8,
+    type=int,
+    help="maximum number of short appjail and director commands (queries) running at the same time"
+)
+_parser.add_argument("--max-jobs",
+    default=2,
+    type=int,
+    help="maximum number of deploy, up, down and destroy jobs running at the same time"
+)
+_parser.add_argument("--bulk-limit",
+    default=2,
+    type=int,
+    help="maximum number of projects processed at the same time by bulk actions (capped at --max-jobs, since each project runs as a job)"
+)
+_parser.add_argument("--projects-interval",
+    default=10,
+    type=float,
+    help="seconds between each refresh of the status of the projects"
+)
+_parser.add_argument("--jails-interval",
+    default=5,
+    type=float,
+    help="seconds between each collection of the status of the jails"
+)
+_parser.add_argument("--workspace-hardlinks",
+    default=False,
+    action="store_true",
+    help="hard link unchanged project files into workspaces instead of copying them"
+)
+_parser.add_argument("--slow-command",
+    default=5,
+    type=float,
+    help="log the commands that take at least this many seconds (0 to disable)"
+)
+_parser.add_argument("--watchdog",
+    default=False,
+    action="store_true",
+    help="log the code that blocks the event loop and list it on /admin/stalls"
+)
+_parser.add_argument("--watchdog-threshold",
+    default=0.25,
+    type=float,
+    help="seconds the event loop has to be blocked to be reported by the watchdog"
+)
+_parser.add_argument("--api-token",
+    default=None,
+    help="require this token as 'Authorization: Bearer <token>' in the requests that modify projects through the API"
+)
 _parser.add_argument("--native",
     default=False,
     action="store_true",
@@ -67,6 +121,9 @@ IMAGE_WIDTH = 240
 IMAGE_HEIGHT = 280
 PROJECTS = _args.projects_dir
 WORKSPACES = _args.workspaces_dir
+DIRECTOR_PROJECTS = _args.director_projects_dir
+SEARCH_DEBOUNCE = 300
+SKELETON_ROWS = 6
 EDITOR_THEME = "githubLight"
 EDITOR_INDENT = " " * 4
 NODESCR = "No description ..."
@@ -84,5 +141,35 @@ HOST_ADDR = _args.host_addr
 HOST_PORT = _args.host_port
 REQUIREMENTS = ("appjail", "appjail-director")
 RESPONSE_TIMEOUT = 60 * 60 * 24
+CONSOLE_MAX_LINES = 5000
+LOG_PAGE_SIZE = 64 * 1024
+LOG_LINE_HEIGHT = 20
+LOG_WINDOW_LINES = 50
+LOG_MARGIN_LINES = 100
 IMAGOTYPE = os.path.join(_rootdir, "files/img/Imagotype.png")
 NATIVE_MODE = _args.native
+API_TOKEN = _args.api_token
+CACHEDIR = _cachedir
+CATALOG_INDEX = os.path.join(_cachedir, "catalog.json")
+THUMBNAILS_DIR = os.path.join(_cachedir, "thumbnails")
+JOBS_DIR = os.path.join(_datadir, "jobs")
+JOBS_HISTORY = 100
+MAX_JOBS = _args.max_jobs
+BULK_LIMIT = min(_args.bulk_limit, _args.max_jobs)
+WORKSPACE_HARDLINKS = _args.workspace_hardlinks
+JAILS_INTERVAL = _args.jails_interval
+MAX_PROCS = _args.max_procs
+PROJECTS_INTERVAL = _args.projects_interval
+SLOW_COMMAND = _args.slow_command
+TRACES_SIZE = 1000
+TRACES_TOP = 20
+LOOP_LAG_INTERVAL = 0.1
+WATCHDOG = _args.watchdog
+WATCHDOG_THRESHOLD = _args.watchdog_threshold
+WATCHDOG_INTERVAL = 0.05
+WATCHDOG_HISTORY = 100
+TAIL_INTERVAL = 0.5
+TAIL_BACKLOG_SIZE = LOG_PAGE_SIZE
+TAIL_READ_SIZE = 1024 * 1024
+TAIL_QUEUE_LINES = 1000
+TAIL_KEEPALIVE = 15
@@ -0,0 +1,95 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import shutil
+import subprocess
+
+from nicegui import run
+
+from appjail_gui.tools.constants import DONE_FILE
+from appjail_gui.tools.constants import INPROGRESS_FILE
+from appjail_gui.tools.constants import WORKSPACE_HARDLINKS
+from appjail_gui.tools.constants import WORKSPACES
+from appjail_gui.tools.director import check_project
+from appjail_gui.tools.director import deploy_project
+from appjail_gui.tools.director import destroy_project
+from appjail_gui.tools.sysexits import EX_CANTCREAT
+from appjail_gui.tools.sync import sync_tree
+from appjail_gui.tools.sync import write_files
+from appjail_gui.tools.sysexits import EX_NOINPUT
+
+async def check_deployment(project):
+    workspace = os.path.join(WORKSPACES, project)
+    done_file = os.path.join(workspace, DONE_FILE)
+    inprogress_file = os.path.join(workspace, INPROGRESS_FILE)
+
+    if os.path.isfile(inprogress_file):
+        return (f"{project}: The project is currently being deployed.", None)
+
+    project_deployed = await check_project(project)
+
+    if project_deployed == 0 \
+            and os.path.isfile(done_file):
+        return (f"{project}: The project already exists!", project_deployed)
+
+    return (None, project_deployed)
+
+async def deploy_workspace(appdir, project, files, on_output=None):
+    workspace = os.path.join(WORKSPACES, project)
+    done_file = os.path.join(workspace, DONE_FILE)
+    inprogress_file = os.path.join(workspace, INPROGRESS_FILE)
+
+    # The project may have changed while the job was waiting in the queue.
+    (error, project_deployed) = await check_deployment(project)
+
+    if error is not None:
+        if on_output is not None:
+            on_output(error)
+
+        return subprocess.CompletedProcess([], EX_CANTCREAT)
+
+    if project_deployed != EX_NOINPUT:
+        await destroy_project(project, workspace, on_output)
+
+    await run.io_bound(sync_tree, appdir, workspace, WORKSPACE_HARDLINKS)
+
+    files = dict(files)
+    files[INPROGRESS_FILE] = ""
+
+    await run.io_bound(write_files, workspace, files)
+
+    proc = await deploy_project(project, workspace, on_output)
+
+    if proc.returncode == 0:
+        shutil.move(inprogress_file, done_file)
+    else:
+        os.remove(inprogress_file)
+
+    return proc
@@ -27,15 +27,32 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import copy
 import json
 import os
 import shutil
 import subprocess
 
+from nicegui import run
+from nicegui.logging import log
+
+from appjail_gui.tools.constants import DIRECTOR_PROJECTS
 from appjail_gui.tools.constants import WORKSPACES
-from appjail_gui.tools.process import run_proc
+from appjail_gui.tools.process import run_proc_async
+
+_describe_cache = {}
+
+async def describe_project(project):
+    key = await run.io_bound(get_state_key, project)
+
+    if key is not None:
+        cached = _describe_cache.get(project)
+
+        # A copy, so that the callers can't modify the cache.
+        if cached is not None \
+                and cached[0] == key:
+            return copy.deepcopy(cached[1])
 
-def get_project_info(project):
     cmd = [
         "appjail-director",
         "describe",
@@ -43,21 +60,52 @@ def get_project_info(project):
         project
     ]
 
-    proc = run_proc(cmd)
+    # A project that can't be described is also one that doesn't pass
+    # `appjail-director check`, so there is no need to run both.
+    proc = await run_proc_async(cmd, stderr=subprocess.DEVNULL)
+
+    if proc.returncode != 0:
+        _describe_cache.pop(project, None)
+        return None
+
+    try:
+        info = json.loads(proc.stdout)
+    except ValueError as err:
+        log.warning(f"{project}: Invalid output of 'appjail-director describe': {err}")
+        return None
 
-    info = json.loads(proc.stdout)
+    if key is not None:
+        _describe_cache[project] = (key, copy.deepcopy(info))
 
     return info
 
-def get_projects():
-    cmd = "appjail-director ls | tail -n +2 | cut -d' ' -f2-"
+def get_state_key(project):
+    directory = os.path.join(DIRECTOR_PROJECTS, project)
 
-    proc = subprocess.run(cmd,
-        shell=True,
-        text=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT
-    )
+    key = []
+
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+
+                key.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    except OSError:
+        # Without the state files there is nothing to validate the cache
+        # with, so the project is always described again.
+        return None
+
+    key.sort()
+
+    return tuple(key)
+
+async def get_projects():
+    cmd = ["appjail-director", "ls"]
+
+    proc = await run_proc_async(cmd)
 
     lines = []
 
@@ -67,7 +115,12 @@ def get_projects():
         for project in os.listdir(WORKSPACES):
             lines.append(f"? {project}")
 
-    lines.extend(proc.stdout.splitlines())
+    # Equivalent to `tail -n +2 | cut -d' ' -f2-`.
+    for line in proc.stdout.splitlines()[1:]:
+        if " " in line:
+            (_, line) = line.split(" ", 1)
+
+        lines.append(line)
 
     for line in lines:
         (status, name) = line.split(" ", 1)
@@ -76,7 +129,7 @@ def get_projects():
 
     return projects
 
-def destroy_project(project, workspace):
+async def destroy_project(project, workspace, on_output=None):
     cmd = [
         "appjail-director",
         "down",
@@ -86,25 +139,25 @@ def destroy_project(project, workspace):
         project
     ]
 
-    proc = run_proc(cmd, workspace)
+    proc = await run_proc_async(cmd, workspace, on_output=on_output)
 
     return proc
 
-def deploy_project(project, workspace):
+async def deploy_project(project, workspace, on_output=None):
     cmd = ["appjail-director", "up", "-p", project]
 
-    proc = run_proc(cmd, workspace)
+    proc = await run_proc_async(cmd, workspace, on_output=on_output)
 
     return proc
 
-def check_project(project):
+async def check_project(project):
     cmd = ["appjail-director", "check", "-p", project]
 
-    proc = run_proc(cmd)
+    proc = await run_proc_async(cmd)
 
     return proc.returncode
 
-def down_project(project, workspace):
+async def down_project(project, workspace, on_output=None):
     cmd = [
         "appjail-director",
         "down",
@@ -112,15 +165,15 @@ def down_project(project, workspace):
         project
     ]
 
-    proc = run_proc(cmd, workspace)
+    proc = await run_proc_async(cmd, workspace, on_output=on_output)
 
     return proc
 
-def destroy_workspace(project, workspace):
-    proc = destroy_project(project, workspace)
+async def destroy_workspace(project, workspace, on_output=None):
+    proc = await destroy_project(project, workspace, on_output)
 
     workspace = os.path.join(WORKSPACES, project)
 
-    shutil.rmtree(workspace)
+    await run.io_bound(shutil.rmtree, workspace)
 
     return proc
@@ -27,35 +27,44 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import bisect
 import os
+import re
+import time
 
 from nicegui import run, ui
 
+from appjail_gui.tools.constants import CONSOLE_MAX_LINES
+from appjail_gui.tools.constants import LOG_LINE_HEIGHT
+from appjail_gui.tools.constants import LOG_MARGIN_LINES
+from appjail_gui.tools.constants import LOG_PAGE_SIZE
+from appjail_gui.tools.constants import LOG_WINDOW_LINES
 from appjail_gui.tools.notification import my_notify
 from appjail_gui.tools.text import sansi
 
 async def listfiles_window(directory):
+    files = await run.io_bound(list_logfiles, directory)
+
     with ui.dialog() as dialog, ui.card().classes("w-10/12 h-4/6"):
         dialog.props("persistent")
         dialog.open()
 
         ui.label(f"{directory}:").props("header").classes("text-bold")
 
-        with ui.list().classes("w-full"):
-            for dirpath, _, filenames in os.walk(directory):
-                for file in filenames:
-                    pathname = os.path.join(dirpath, file)
-
-                    with open(pathname) as fd:
-                        content = await run.io_bound(fd.read)
+        with ui.scroll_area().classes("w-full h-full"):
+            with ui.list().classes("w-full"):
+                for (display_name, pathname, size, mtime) in files:
+                    with ui.item(on_click=lambda e, p=pathname: open_logfile(p)).classes("border-2"):
+                        with ui.item_section():
+                            ui.item_label(display_name)
 
-                        display_name = os.path.join(
-                            os.path.basename(dirpath), file
-                        )
-
-                        ui.item(display_name,
-                            on_click=lambda e, c=content: open_consolelog(c)
-                        ).classes("border-2")
+                        with ui.item_section().props("side"):
+                            ui.item_label(
+                                "%s, %s" % (
+                                    format_size(size),
+                                    time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(mtime))
+                                )
+                            ).props("caption")
 
         ui.separator()
 
@@ -65,6 +74,153 @@ async def listfiles_window(directory):
             on_click=lambda e: (dialog.close(), dialog.clear())
         )
 
+def list_logfiles(directory):
+    files = []
+
+    for dirpath, _, filenames in os.walk(directory):
+        for file in sorted(filenames):
+            pathname = os.path.join(dirpath, file)
+
+            try:
+                stat = os.stat(pathname)
+            except OSError:
+                continue
+
+            display_name = os.path.join(
+                os.path.basename(dirpath), file
+            )
+
+            files.append((display_name, pathname, stat.st_size, stat.st_mtime))
+
+    return files
+
+def format_size(size):
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 \
+                or unit == "GiB":
+            break
+
+        size /= 1024
+
+    if unit == "B":
+        return f"{size} {unit}"
+    else:
+        return f"{size:.1f} {unit}"
+
+def read_logpage(pathname, offset, size, backward=True):
+    with open(pathname, "rb") as fd:
+        file_size = os.fstat(fd.fileno()).st_size
+
+        if offset is None \
+                or offset > file_size:
+            offset = file_size
+
+        if backward:
+            end = offset
+            start = max(0, end - size)
+        else:
+            start = offset
+            end = min(file_size, start + size)
+
+        if start > 0:
+            fd.seek(start - 1)
+
+            aligned = fd.read(1) == b"\n"
+        else:
+            aligned = True
+
+        content = fd.read(end - start)
+
+    # Pages start and end on line boundaries, except when a single line
+    # does not fit in a page.
+    if not aligned:
+        newline = content.find(b"\n")
+
+        if newline != -1 \
+                and newline + 1 < len(content):
+            content = content[newline + 1:]
+            start += newline + 1
+
+    if end < file_size:
+        newline = content.rfind(b"\n")
+
+        if newline != -1:
+            end -= len(content) - newline - 1
+            content = content[:newline + 1]
+
+    return (start, end, file_size, content.decode(errors="replace"))
+
+async def open_logfile(pathname):
+    if not os.path.isfile(pathname):
+        my_notify("This log has no content!", "warning")
+        return
+
+    (start, end, file_size, content) = await run.io_bound(
+        read_logpage, pathname, None, LOG_PAGE_SIZE
+    )
+
+    if file_size == 0:
+        my_notify("This log has no content!", "warning")
+        return
+
+    async def load_page(offset, backward):
+        nonlocal start, end, file_size
+
+        (start, end, file_size, content) = await run.io_bound(
+            read_logpage, pathname, offset, LOG_PAGE_SIZE, backward
+        )
+
+        show_page(content)
+
+    def show_page(content):
+        log_text.text = sansi(content)
+        position.text = f"{start}-{end} / {file_size} bytes"
+
+        older_button.set_enabled(start > 0)
+        newer_button.set_enabled(end < file_size)
+
+    with ui.dialog() as log_dialog, ui.card().classes("w-10/12 h-4/6"):
+        log_dialog.props("persistent")
+        log_dialog.open()
+
+        ui.label(f"{pathname}:").props("header").classes("text-bold")
+
+        with ui.scroll_area().classes("w-full h-full border-2"):
+            log_text = ui.label().style("white-space: pre-wrap")
+
+        with ui.row().classes("items-center"):
+            ui.button("Close",
+                icon="close",
+                color="white",
+                on_click=lambda e: (log_dialog.close(), log_dialog.clear())
+            )
+
+            ui.button(icon="first_page",
+                color="white",
+                on_click=lambda e: load_page(0, False)
+            ).tooltip("first page")
+
+            older_button = ui.button(icon="chevron_left",
+                color="white",
+                on_click=lambda e: load_page(start, True)
+            )
+            older_button.tooltip("older")
+
+            newer_button = ui.button(icon="chevron_right",
+                color="white",
+                on_click=lambda e: load_page(end, False)
+            )
+            newer_button.tooltip("newer")
+
+            ui.button(icon="last_page",
+                color="white",
+                on_click=lambda e: load_page(None, True)
+            ).tooltip("last page")
+
+            position = ui.label()
+
+    show_page(content)
+
 def open_consolelog(text, after_close=lambda: None):
     text = sansi(text)
 
@@ -72,17 +228,173 @@ def open_consolelog(text, after_close=lambda: None):
         my_notify("This log has no content!", "warning")
         return
 
+    offsets = build_line_index(text)
+    total = len(offsets)
+    current = 0
+    visible = LOG_WINDOW_LINES
+    rendered = (0, 0)
+
+    def render(first):
+        nonlocal rendered
+
+        start = max(0, first - LOG_MARGIN_LINES)
+        end = min(total, first + visible + LOG_MARGIN_LINES)
+
+        log_text.text = get_lines(text, offsets, start, end)
+        log_text.style(f"top: {start * LOG_LINE_HEIGHT}px")
+
+        rendered = (start, end)
+
+    def show_position():
+        position.text = f"Line {current + 1} of {total}"
+
+    def on_scroll(e):
+        nonlocal current, visible
+
+        current = min(total - 1, int(e.vertical_position // LOG_LINE_HEIGHT))
+        visible = max(1, int(e.vertical_container_size // LOG_LINE_HEIGHT) + 1)
+
+        (start, end) = rendered
+
+        # Only send new lines when the visible window leaves the rendered one.
+        if current < start \
+                or min(total, current + visible) > end:
+            render(current)
+
+        show_position()
+
+    def search_log(e):
+        nonlocal current
+
+        if not search.value:
+            return
+
+        pattern = re.compile(re.escape(search.value), re.IGNORECASE)
+
+        if current + 1 < total:
+            match = pattern.search(text, offsets[current + 1])
+        else:
+            match = None
+
+        if match is None:
+            match = pattern.search(text)
+
+        if match is None:
+            my_notify(f"{search.value}: Not found.", "warning")
+            return
+
+        current = bisect.bisect_right(offsets, match.start()) - 1
+
+        render(current)
+        show_position()
+
+        scroll_area.scroll_to(pixels=current * LOG_LINE_HEIGHT)
+
     with ui.dialog() as log_dialog, ui.card().classes("w-10/12 h-4/6"):
         log_dialog.props("persistent")
         log_dialog.open()
 
         ui.label("Console Log:").props("header").classes("text-bold")
 
-        with ui.scroll_area().classes("w-full h-full border-2"):
-            ui.label(text).style("white-space: pre-wrap")
+        with ui.scroll_area(on_scroll=on_scroll).classes("w-full h-full border-2") as scroll_area:
+            with ui.element("div").style(f"position: relative; height: {total * LOG_LINE_HEIGHT}px"):
+                log_text = ui.label().style(
+                    "position: absolute; left: 0; white-space: pre; font-family: monospace; "
+                    f"line-height: {LOG_LINE_HEIGHT}px"
+                )
 
-        ui.button("Close",
-            icon="close",
-            color="white",
-            on_click=lambda e: (log_dialog.close(), log_dialog.clear(), after_close())
-        )
+        with ui.row().classes("w-full items-center"):
+            ui.button("Close",
+                icon="close",
+                color="white",
+                on_click=lambda e: (log_dialog.close(), log_dialog.clear(), after_close())
+            )
+
+            search = ui.input(placeholder="Search ...")
+            search.on("keydown.enter", search_log)
+
+            ui.button(icon="search",
+                color="white",
+                on_click=search_log
+            ).tooltip("find next")
+
+            position = ui.label()
+
+    render(0)
+    show_position()
+
+def build_line_index(text):
+    offsets = [0]
+
+    index = text.find("\n")
+
+    while index != -1:
+        offsets.append(index + 1)
+
+        index = text.find("\n", index + 1)
+
+    return offsets
+
+def get_lines(text, offsets, start, end):
+    if end < len(offsets):
+        return text[offsets[start]:offsets[end] - 1]
+    else:
+        return text[offsets[start]:]
+
+async def open_joblog(job, after_close=lambda: None):
+    def on_job_event(job, line):
+        if line is None:
+            show_status()
+        else:
+            log.push(line)
+
+    def show_status():
+        status.text = f"Status: {job.status}"
+
+        loading_spinner.visible = job.is_active()
+        fulllog_button.set_enabled(not job.is_active())
+
+    def close_joblog():
+        job.listeners.remove(on_job_event)
+
+        log_dialog.close()
+        log_dialog.clear()
+
+        after_close()
+
+    with ui.dialog() as log_dialog, ui.card().classes("w-10/12 h-4/6"):
+        log_dialog.props("persistent")
+        log_dialog.open()
+
+        ui.label(f"{job.project} ({job.kind}):").props("header").classes("text-bold")
+
+        log = ui.log(max_lines=CONSOLE_MAX_LINES).classes("w-full h-full border-2")
+
+        with ui.row().classes("items-center"):
+            ui.button("Close",
+                icon="close",
+                color="white",
+                on_click=lambda e: close_joblog()
+            )
+
+            fulllog_button = ui.button("Full Log",
+                icon="description",
+                color="white",
+                on_click=lambda e: open_logfile(job.logfile)
+            )
+
+            status = ui.label()
+
+            loading_spinner = ui.spinner("tail",
+                color="black",
+                size="2em"
+            )
+
+    output = await job.get_output()
+
+    if len(output) > 0:
+        log.push("\n".join(output))
+
+    show_status()
+
+    job.listeners.add(ui.context.client, on_job_event)
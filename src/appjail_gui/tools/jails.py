@@ -0,0 +1,118 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+
+from nicegui import background_tasks
+from nicegui.logging import log
+
+from appjail_gui.tools.appjail import get_jails
+from appjail_gui.tools.constants import JAILS_INTERVAL
+from appjail_gui.tools.listeners import Listeners
+from appjail_gui.tools.tracing import trace_action
+
+JAILS_KEYWORDS = ("name", "status", "type", "version", "network_ip4", "ports")
+
+_jails = None
+_listeners = Listeners("jails")
+_refresh_lock = asyncio.Lock()
+_wakeup = asyncio.Event()
+
+def start_jails_collector():
+    background_tasks.create(collect_jails(), name="collect_jails")
+
+async def collect_jails():
+    while True:
+        _wakeup.clear()
+
+        # Nobody is watching, so there is no reason to spawn anything.
+        if len(_listeners) > 0:
+            try:
+                with trace_action("jails collector"):
+                    await refresh_jails()
+            except Exception:
+                log.exception("An exception occurred while collecting the jails")
+
+        try:
+            await asyncio.wait_for(_wakeup.wait(), JAILS_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+async def refresh_jails():
+    global _jails
+
+    async with _refresh_lock:
+        table = await get_jails(JAILS_KEYWORDS)
+
+        jails = {}
+
+        for attrs in table:
+            jails[attrs["name"]] = attrs
+
+        (changed, removed) = diff_jails(_jails or {}, jails)
+
+        _jails = jails
+
+    if len(changed) > 0 \
+            or len(removed) > 0:
+        _listeners.notify(changed, removed)
+
+    return _jails
+
+def diff_jails(old, new):
+    changed = {}
+
+    for (name, attrs) in new.items():
+        if old.get(name) != attrs:
+            changed[name] = attrs
+
+    removed = [name for name in old if name not in new]
+
+    return (changed, removed)
+
+async def get_cached_jails():
+    if _jails is None:
+        return await refresh_jails()
+
+    return _jails
+
+async def get_current_jails():
+    # Without listeners the collector is idle and the cache may be stale.
+    if len(_listeners) == 0:
+        return await refresh_jails()
+
+    return await get_cached_jails()
+
+def invalidate_jails():
+    _wakeup.set()
+
+def add_jails_listener(client, callback):
+    _listeners.add(client, callback)
+
+    invalidate_jails()
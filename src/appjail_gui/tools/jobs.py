@@ -0,0 +1,350 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import collections
+import itertools
+import json
+import os
+import time
+import uuid
+
+from nicegui import background_tasks, run
+from nicegui.logging import log
+
+from appjail_gui.tools.constants import CONSOLE_MAX_LINES
+from appjail_gui.tools.constants import JOBS_DIR
+from appjail_gui.tools.constants import JOBS_HISTORY
+from appjail_gui.tools.constants import LOG_PAGE_SIZE
+from appjail_gui.tools.constants import MAX_JOBS
+from appjail_gui.tools.listeners import Listeners
+from appjail_gui.tools.metrics import JOB_DURATION
+from appjail_gui.tools.tracing import trace_action
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_INTERRUPTED = "interrupted"
+
+JOB_PRIORITY_HIGH = 0
+JOB_PRIORITY_NORMAL = 50
+JOB_PRIORITY_LOW = 100
+
+_jobs = collections.OrderedDict()
+_active = {}
+_queue = asyncio.PriorityQueue()
+_sequence = itertools.count()
+_listeners = Listeners("jobs")
+
+class Job:
+    def __init__(self, kind, project, priority=JOB_PRIORITY_NORMAL, job_id=None):
+        if job_id is None:
+            job_id = uuid.uuid4().hex[:12]
+
+        self.id = job_id
+        self.kind = kind
+        self.project = project
+        self.priority = priority
+        self.status = JOB_QUEUED
+        self.returncode = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.action = None
+        self.on_done = None
+        self.output = None
+        self.listeners = Listeners(f"job {self.id}")
+        self.logfile = os.path.join(JOBS_DIR, f"{self.id}.log")
+        self.statefile = os.path.join(JOBS_DIR, f"{self.id}.json")
+        self._logfd = None
+
+    def is_active(self):
+        return self.status in (JOB_QUEUED, JOB_RUNNING)
+
+    async def get_output(self):
+        # Jobs loaded from disk read the tail of their log the first time
+        # their output is requested.
+        if self.output is None:
+            output = await run.io_bound(read_tail, self.logfile, CONSOLE_MAX_LINES)
+
+            if self.output is None:
+                self.output = collections.deque(output, maxlen=CONSOLE_MAX_LINES)
+
+        return self.output
+
+    def push(self, line):
+        self.output.append(line)
+
+        if self._logfd is not None:
+            self._logfd.write(line + "\n")
+
+        self.listeners.notify(self, line)
+
+    def to_dict(self):
+        return {
+            "id" : self.id,
+            "kind" : self.kind,
+            "project" : self.project,
+            "priority" : self.priority,
+            "status" : self.status,
+            "returncode" : self.returncode,
+            "created" : self.created,
+            "started" : self.started,
+            "finished" : self.finished
+        }
+
+    def set_status(self, status):
+        self.status = status
+
+        save_job(self)
+
+        self.listeners.notify(self, None)
+        _listeners.notify(self)
+
+def submit_job(kind, project, action, priority=JOB_PRIORITY_NORMAL, on_done=None):
+    job = _active.get(project)
+
+    # A project can only have one pending job at a time.
+    if job is not None:
+        return (job, False)
+
+    job = Job(kind, project, priority)
+    job.action = action
+    job.on_done = on_done
+    job.output = collections.deque(maxlen=CONSOLE_MAX_LINES)
+
+    _jobs[job.id] = job
+    _active[project] = job
+
+    prune_jobs()
+
+    _queue.put_nowait((priority, next(_sequence), job))
+
+    job.set_status(JOB_QUEUED)
+
+    return (job, True)
+
+def get_job(job_id):
+    return _jobs.get(job_id)
+
+def get_jobs():
+    return list(_jobs.values())
+
+def get_active_job(project):
+    return _active.get(project)
+
+def add_jobs_listener(client, callback):
+    _listeners.add(client, callback)
+
+def remove_jobs_listener(callback):
+    _listeners.remove(callback)
+
+def start_job_workers():
+    load_jobs()
+
+    for worker in range(MAX_JOBS):
+        background_tasks.create(job_worker(), name=f"job_worker_{worker}")
+
+async def job_worker():
+    while True:
+        (_, _, job) = await _queue.get()
+
+        try:
+            await run_job(job)
+        except Exception:
+            log.exception(f"An exception occurred while running the job '{job.id}'")
+        finally:
+            _queue.task_done()
+
+async def run_job(job):
+    os.makedirs(JOBS_DIR, exist_ok=True)
+
+    job._logfd = open(job.logfile, "a")
+    job.started = time.time()
+    job.set_status(JOB_RUNNING)
+
+    try:
+        with trace_action(f"job {job.kind}"):
+            proc = await job.action(job.push)
+
+        job.returncode = proc.returncode
+    except Exception as err:
+        log.exception(f"An exception occurred while running the job '{job.id}'")
+
+        job.push(f"{err.__class__.__name__}: {err}")
+    finally:
+        job._logfd.close()
+        job._logfd = None
+        job.finished = time.time()
+
+        _active.pop(job.project, None)
+
+    if job.returncode == 0:
+        job.set_status(JOB_DONE)
+    else:
+        job.set_status(JOB_FAILED)
+
+    JOB_DURATION.observe(job.finished - job.started,
+        kind=job.kind,
+        project=job.project,
+        status=job.status
+    )
+
+    if job.on_done is not None:
+        try:
+            job.on_done(job)
+        except Exception:
+            log.exception(f"An exception occurred after running the job '{job.id}'")
+
+def read_tail(pathname, lines):
+    try:
+        fd = open(pathname, "rb")
+    except FileNotFoundError:
+        return []
+
+    # Read backward until there are enough lines, instead of the whole log.
+    with fd:
+        end = os.fstat(fd.fileno()).st_size
+
+        chunks = []
+        newlines = 0
+
+        while end > 0 \
+                and newlines <= lines:
+            start = max(0, end - LOG_PAGE_SIZE)
+
+            fd.seek(start)
+
+            chunk = fd.read(end - start)
+
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+
+            end = start
+
+    content = b"".join(reversed(chunks)).decode(errors="replace")
+
+    return content.splitlines()[-lines:]
+
+def remove_job_files(job_id):
+    for ext in (".json", ".log"):
+        try:
+            os.remove(os.path.join(JOBS_DIR, f"{job_id}{ext}"))
+        except FileNotFoundError:
+            pass
+        except OSError:
+            log.exception(f"{job_id}: An exception occurred while removing the files of the job")
+
+def save_job(job):
+    os.makedirs(JOBS_DIR, exist_ok=True)
+
+    tmpname = f"{job.statefile}.tmp"
+
+    with open(tmpname, "w") as fd:
+        json.dump(job.to_dict(), fd)
+
+    os.replace(tmpname, job.statefile)
+
+def load_jobs():
+    if not os.path.isdir(JOBS_DIR):
+        return
+
+    states = []
+    logs = set()
+
+    for file in os.listdir(JOBS_DIR):
+        (job_id, ext) = os.path.splitext(file)
+
+        if ext == ".log":
+            logs.add(job_id)
+            continue
+
+        if ext != ".json":
+            continue
+
+        try:
+            mtime = os.stat(os.path.join(JOBS_DIR, file)).st_mtime
+        except OSError:
+            continue
+
+        states.append((mtime, job_id))
+
+    # The state file is written on every change of status, so the newest
+    # ones belong to the latest jobs. Only those are read; the rest are
+    # removed along with their logs.
+    states.sort(reverse=True)
+
+    for (_, job_id) in states[JOBS_HISTORY:]:
+        remove_job_files(job_id)
+
+    states = states[:JOBS_HISTORY]
+
+    for job_id in logs - { job_id for (_, job_id) in states }:
+        remove_job_files(job_id)
+
+    jobs = []
+
+    for (_, job_id) in states:
+        file = f"{job_id}.json"
+
+        try:
+            with open(os.path.join(JOBS_DIR, file)) as fd:
+                state = json.load(fd)
+
+            job = Job(state["kind"], state["project"], state["priority"], state["id"])
+            job.status = state["status"]
+            job.returncode = state["returncode"]
+            job.created = state["created"]
+            job.started = state["started"]
+            job.finished = state["finished"]
+        except Exception:
+            log.exception(f"{file}: An exception occurred while loading the job")
+            continue
+
+        jobs.append(job)
+
+    jobs.sort(key=lambda job: job.created)
+
+    for job in jobs:
+        # The server stopped while these jobs were pending.
+        if job.is_active():
+            job.status = JOB_INTERRUPTED
+
+            save_job(job)
+
+        _jobs[job.id] = job
+
+def prune_jobs():
+    finished = [job for job in _jobs.values() if not job.is_active()]
+
+    for job in finished[:max(0, len(_jobs) - JOBS_HISTORY)]:
+        del _jobs[job.id]
+
+        remove_job_files(job.id)
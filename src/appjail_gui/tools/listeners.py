@@ -0,0 +1,65 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from nicegui import Client
+from nicegui.logging import log
+
+class Listeners:
+    def __init__(self, name):
+        self.name = name
+        self.listeners = []
+
+    def add(self, client, callback):
+        self.listeners.append((client, callback))
+
+    def remove(self, callback):
+        self.listeners = [
+            listener for listener in self.listeners if listener[1] != callback
+        ]
+
+    def prune(self):
+        # Listeners registered by a page are dropped along with its client.
+        self.listeners = [
+            (client, callback) for (client, callback) in self.listeners
+                if client is None or client.id in Client.instances
+        ]
+
+    def notify(self, *args):
+        self.prune()
+
+        for (client, callback) in list(self.listeners):
+            try:
+                callback(*args)
+            except Exception:
+                log.exception(f"An exception occurred while notifying a change in the {self.name}")
+
+    def __len__(self):
+        self.prune()
+
+        return len(self.listeners)
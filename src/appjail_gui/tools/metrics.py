@@ -0,0 +1,252 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import math
+import os
+
+from fastapi.responses import PlainTextResponse
+from nicegui import app, background_tasks, Client, run
+
+from appjail_gui.tools.catalog import get_catalog_size
+from appjail_gui.tools.constants import LOOP_LAG_INTERVAL
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 3600)
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+NESTED_COMMANDS = ("jail", "image", "network")
+
+_registry = []
+_cpu_bound_tasks = 0
+
+class Metric:
+    type = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.values = {}
+
+        _registry.append(self)
+
+    def key(self, labels):
+        return tuple(str(labels[label]) for label in self.labels)
+
+    def samples(self):
+        for (key, value) in self.values.items():
+            yield (self.name, dict(zip(self.labels, key)), value)
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, value=1, **labels):
+        key = self.key(labels)
+
+        self.values[key] = self.values.get(key, 0) + value
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def __init__(self, name, help, labels=(), function=None):
+        super().__init__(name, help, labels)
+
+        self.function = function
+
+    def set(self, value, **labels):
+        self.values[self.key(labels)] = value
+
+    def samples(self):
+        if self.function is not None:
+            yield (self.name, {}, self.function())
+        else:
+            yield from super().samples()
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+
+        self.buckets = tuple(buckets) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self.key(labels)
+
+        if key not in self.values:
+            self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+
+        (counts, _, _) = entry = self.values[key]
+
+        for (index, bucket) in enumerate(self.buckets):
+            if value <= bucket:
+                counts[index] += 1
+                break
+
+        entry[1] += value
+        entry[2] += 1
+
+    def samples(self):
+        for (key, (counts, total, count)) in self.values.items():
+            labels = dict(zip(self.labels, key))
+
+            cumulative = 0
+
+            for (bucket, bucket_count) in zip(self.buckets, counts):
+                cumulative += bucket_count
+
+                le = "+Inf" if bucket == math.inf else repr(float(bucket))
+
+                yield (f"{self.name}_bucket", { **labels, "le" : le }, cumulative)
+
+            yield (f"{self.name}_sum", labels, total)
+            yield (f"{self.name}_count", labels, count)
+
+def command_labels(cmd):
+    argv0 = os.path.basename(cmd[0])
+
+    # Only subcommands are used, never their arguments, to keep the number
+    # of series small (e.g. "appjail jail get", not the jail or keyword).
+    words = [argv0]
+
+    if len(cmd) > 1:
+        words.append(cmd[1])
+
+        if cmd[1] in NESTED_COMMANDS \
+                and len(cmd) > 2:
+            words.append(cmd[2])
+
+    return {
+        "command" : " ".join(words),
+        "argv0" : argv0
+    }
+
+def record_command(cmd, returncode, duration):
+    labels = command_labels(cmd)
+
+    COMMANDS_TOTAL.inc(exit_code=returncode, **labels)
+    COMMAND_DURATION.observe(duration, **labels)
+
+def start_loop_lag_probe():
+    background_tasks.create(probe_loop_lag(), name="probe_loop_lag")
+
+async def probe_loop_lag():
+    loop = asyncio.get_running_loop()
+
+    while True:
+        start = loop.time()
+
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+
+        # Anything beyond the requested sleep is time in which the loop was
+        # busy running something else.
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - start - LOOP_LAG_INTERVAL))
+
+async def run_cpu_bound(func, *args):
+    global _cpu_bound_tasks
+
+    # Counted here because the executor doesn't expose its queue.
+    _cpu_bound_tasks += 1
+
+    try:
+        return await run.cpu_bound(func, *args)
+    finally:
+        _cpu_bound_tasks -= 1
+
+def process_pool_queue_depth():
+    return _cpu_bound_tasks
+
+def connected_clients():
+    return sum(1 for client in list(Client.instances.values()) if client.has_socket_connection)
+
+def render_metrics():
+    lines = []
+
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+
+        for (name, labels, value) in metric.samples():
+            if len(labels) > 0:
+                labels = ",".join(
+                    '%s="%s"' % (label, escape_label(value)) for (label, value) in labels.items()
+                )
+
+                lines.append(f"{name}{{{labels}}} {format_value(value)}")
+            else:
+                lines.append(f"{name} {format_value(value)}")
+
+    return "\n".join(lines) + "\n"
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def format_value(value):
+    if isinstance(value, float):
+        return repr(value)
+
+    return str(value)
+
+COMMANDS_TOTAL = Counter("appjail_gui_commands_total",
+    "Commands executed by run_proc, by command and exit code.",
+    ("command", "argv0", "exit_code")
+)
+COMMAND_DURATION = Histogram("appjail_gui_command_duration_seconds",
+    "Wall time of the commands executed by run_proc.",
+    ("command", "argv0")
+)
+PAGE_RENDER = Histogram("appjail_gui_page_render_seconds",
+    "Time needed to build a page.",
+    ("page",)
+)
+JOB_DURATION = Histogram("appjail_gui_job_duration_seconds",
+    "Duration of deploy, up, down and destroy jobs.",
+    ("kind", "project", "status")
+)
+PROCESS_POOL_QUEUE = Gauge("appjail_gui_process_pool_queue_depth",
+    "Work items submitted to the NiceGUI process pool that have not finished yet.",
+    function=process_pool_queue_depth
+)
+CLIENTS = Gauge("appjail_gui_clients",
+    "Connected NiceGUI clients.",
+    function=connected_clients
+)
+EVENT_LOOP_LAG = Histogram("appjail_gui_event_loop_lag_seconds",
+    "Delay of the event loop in waking up a task that sleeps periodically.",
+    buckets=LAG_BUCKETS
+)
+CATALOG_SIZE = Gauge("appjail_gui_catalog_size",
+    "Applications in the Store catalog.",
+    function=get_catalog_size
+)
+
+@app.get("/metrics")
+async def metrics_handler():
+    return PlainTextResponse(render_metrics(),
+        media_type="text/plain; version=0.0.4"
+    )
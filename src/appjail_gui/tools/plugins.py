@@ -0,0 +1,179 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import ast
+import importlib.util
+import os
+import sys
+
+from nicegui.logging import log
+
+from appjail_gui.tools.constants import NODESCR
+from appjail_gui.tools.constants import PLUGINS
+
+_registry = {}
+_modules = {}
+
+def scan_plugins():
+    global _registry
+
+    os.makedirs(PLUGINS, exist_ok=True)
+
+    registry = {}
+
+    for plugin in os.listdir(PLUGINS):
+        (plugin_name, ext) = os.path.splitext(plugin)
+
+        if ext != ".py":
+            continue
+
+        plugin_file = os.path.join(PLUGINS, plugin)
+
+        try:
+            stat = os.stat(plugin_file)
+        except OSError:
+            continue
+
+        if not os.path.isfile(plugin_file):
+            continue
+
+        entry = _registry.get(plugin_name)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        if entry is None \
+                or entry["version"] != version:
+            entry = parse_plugin(plugin_file)
+
+            if entry is None:
+                continue
+
+            entry["version"] = version
+
+        registry[plugin_name] = entry
+
+    _registry = registry
+
+    return registry
+
+def parse_plugin(plugin_file):
+    try:
+        with open(plugin_file) as fd:
+            tree = ast.parse(fd.read(), plugin_file)
+    except Exception:
+        log.exception(f"An exception occurred while parsing the plugin '{plugin_file}'")
+        return
+
+    chk_attr_main = False
+    chk_attr_descr = False
+
+    descr = None
+
+    # Only the top-level statements are inspected, so the plugin is not
+    # executed until it is used for the first time.
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) \
+                and node.name == "main":
+            chk_attr_main = True
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            if isinstance(node, ast.AnnAssign):
+                # A bare annotation (`descr: str`) doesn't define anything.
+                if node.value is None:
+                    continue
+
+                targets = [node.target]
+            else:
+                targets = node.targets
+
+            for target in targets:
+                if not isinstance(target, ast.Name):
+                    continue
+
+                if target.id == "main":
+                    chk_attr_main = True
+                elif target.id == "descr":
+                    chk_attr_descr = True
+
+                    # literal_eval() raises TypeError too, e.g. for {[1]: 2}.
+                    try:
+                        descr = ast.literal_eval(node.value)
+                    except Exception:
+                        descr = None
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if (alias.asname or alias.name) == "main":
+                    chk_attr_main = True
+
+    if not chk_attr_main:
+        log.warning(f"Plugin '{plugin_file}' doesn't have the 'main' function.")
+        return
+
+    if not chk_attr_descr:
+        log.warning(f"Plugin '{plugin_file}' doesn't have the 'descr' attribute.")
+        return
+
+    if not isinstance(descr, str):
+        docstring = ast.get_docstring(tree)
+
+        if docstring:
+            descr = docstring.splitlines()[0]
+        else:
+            descr = NODESCR
+
+    return {
+        "file" : plugin_file,
+        "descr" : descr
+    }
+
+def load_plugin(plugin_name):
+    entry = _registry[plugin_name]
+    plugin_file = entry["file"]
+
+    stat = os.stat(plugin_file)
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _modules.get(plugin_name)
+
+    if cached is not None:
+        (cached_version, mod) = cached
+
+        if cached_version == version:
+            return mod
+
+    mod_name = "appjail_gui.plugins.%s" % plugin_name
+    spec = importlib.util.spec_from_file_location(
+        mod_name,
+        plugin_file
+    )
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[mod_name] = mod
+    spec.loader.exec_module(mod)
+
+    _modules[plugin_name] = (version, mod)
+
+    return mod
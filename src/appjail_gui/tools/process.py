@@ -27,12 +27,106 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import asyncio
 import subprocess
+import time
+
+from appjail_gui.tools.constants import MAX_PROCS
+from appjail_gui.tools.metrics import record_command
+from appjail_gui.tools.text import LineDecoder
+from appjail_gui.tools.tracing import record_trace
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_procs_semaphore = asyncio.Semaphore(MAX_PROCS)
 
 def run_proc(cmd, workspace=None, stdout=subprocess.PIPE, stderr=subprocess.STDOUT):
-    return subprocess.run(cmd,
+    started = time.time()
+    start = time.monotonic()
+
+    proc = subprocess.run(cmd,
         cwd=workspace,
         text=True,
         stdout=stdout,
         stderr=stderr
     )
+
+    output_bytes = len(proc.stdout.encode(errors="replace")) if proc.stdout is not None else 0
+
+    finish_command(cmd, workspace, started, time.monotonic() - start, proc.returncode, output_bytes)
+
+    return proc
+
+async def run_proc_async(cmd, workspace=None, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, on_output=None):
+    if on_output is None:
+        async with _procs_semaphore:
+            return await capture_proc(cmd, workspace, stdout, stderr)
+
+    # Streamed commands are the long ones (appjail-director up, down, ...).
+    # They are already limited by the job workers, and holding a slot of
+    # the semaphore for minutes would starve the pollers and the UI.
+    return await stream_proc(cmd, workspace, stderr, on_output)
+
+async def capture_proc(cmd, workspace, stdout, stderr):
+    started = time.time()
+    start = time.monotonic()
+
+    proc = await asyncio.create_subprocess_exec(*cmd,
+        cwd=workspace,
+        stdout=stdout,
+        stderr=stderr
+    )
+
+    (output, _) = await proc.communicate()
+
+    output_bytes = len(output) if output is not None else 0
+
+    finish_command(cmd, workspace, started, time.monotonic() - start, proc.returncode, output_bytes)
+
+    if output is not None:
+        output = output.decode(errors="replace")
+
+    return subprocess.CompletedProcess(cmd, proc.returncode, output)
+
+async def stream_proc(cmd, workspace, stderr, on_output):
+    started = time.time()
+    start = time.monotonic()
+
+    proc = await asyncio.create_subprocess_exec(*cmd,
+        cwd=workspace,
+        stdout=subprocess.PIPE,
+        stderr=stderr
+    )
+
+    output_bytes = await stream_output(proc.stdout, on_output)
+    await proc.wait()
+
+    finish_command(cmd, workspace, started, time.monotonic() - start, proc.returncode, output_bytes)
+
+    return subprocess.CompletedProcess(cmd, proc.returncode, None)
+
+def finish_command(cmd, workspace, started, duration, returncode, output_bytes):
+    record_command(cmd, returncode, duration)
+    record_trace(cmd, workspace, started, duration, returncode, output_bytes)
+
+async def stream_output(reader, on_output):
+    # The escape sequences are removed here, once, instead of by every
+    # consumer of each line.
+    decoder = LineDecoder()
+    output_bytes = 0
+
+    while True:
+        chunk = await reader.read(STREAM_CHUNK_SIZE)
+
+        if chunk == b"":
+            break
+
+        output_bytes += len(chunk)
+
+        for line in decoder.feed(chunk):
+            on_output(line)
+
+    for line in decoder.flush():
+        on_output(line)
+
+    return output_bytes
@@ -0,0 +1,109 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+
+from nicegui import background_tasks
+from nicegui.logging import log
+
+from appjail_gui.tools.constants import PROJECTS_INTERVAL
+from appjail_gui.tools.director import get_projects
+from appjail_gui.tools.listeners import Listeners
+from appjail_gui.tools.tracing import trace_action
+
+PROJECT_STATUSES = {
+    "+" : "DONE",
+    "-" : "FAILED",
+    "!" : "UNFINISHED",
+    "x" : "DESTROYING"
+}
+
+PROJECT_STATUS_COLORS = {
+    "DONE" : "green",
+    "FAILED" : "red",
+    "UNFINISHED" : "brown",
+    "DESTROYING" : "yellow",
+    "UNKNOWN" : "blue"
+}
+
+_projects = None
+_listeners = Listeners("projects")
+_refresh_lock = asyncio.Lock()
+_wakeup = asyncio.Event()
+
+def start_projects_poller():
+    background_tasks.create(poll_projects(), name="poll_projects")
+
+async def poll_projects():
+    while True:
+        _wakeup.clear()
+
+        try:
+            with trace_action("projects poller"):
+                await refresh_projects()
+        except Exception:
+            log.exception("An exception occurred while refreshing the status of the projects")
+
+        try:
+            await asyncio.wait_for(_wakeup.wait(), PROJECTS_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+async def refresh_projects():
+    global _projects
+
+    async with _refresh_lock:
+        projects = await get_projects()
+
+    if projects == _projects:
+        return _projects
+
+    _projects = projects
+
+    _listeners.notify()
+
+    return _projects
+
+def invalidate_projects():
+    _wakeup.set()
+
+async def get_cached_projects():
+    if _projects is None:
+        return await refresh_projects()
+
+    return _projects
+
+def get_cached_projects_nowait():
+    if _projects is None:
+        return {}
+
+    return _projects
+
+def add_projects_listener(client, callback):
+    _listeners.add(client, callback)
@@ -0,0 +1,259 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import hashlib
+import os
+import shutil
+import stat
+
+HASH_CHUNK_SIZE = 1024 * 1024
+COPY_CHUNK_SIZE = 16 * 1024 * 1024
+
+def sync_tree(src, dst, hardlinks=False):
+    summary = {
+        "copied" : 0,
+        "linked" : 0,
+        "unchanged" : 0,
+        "removed" : 0
+    }
+
+    _sync_dir(src, dst, hardlinks, summary)
+
+    return summary
+
+def _sync_dir(src, dst, hardlinks, summary):
+    try:
+        dst_stat = os.lstat(dst)
+    except FileNotFoundError:
+        dst_stat = None
+
+    if dst_stat is not None \
+            and not stat.S_ISDIR(dst_stat.st_mode):
+        os.remove(dst)
+        dst_stat = None
+
+    if dst_stat is None:
+        os.makedirs(dst)
+
+    names = set()
+
+    with os.scandir(src) as entries:
+        for entry in entries:
+            names.add(entry.name)
+
+            dst_path = os.path.join(dst, entry.name)
+
+            if entry.is_symlink():
+                _sync_symlink(entry.path, dst_path, summary)
+            elif entry.is_dir():
+                _sync_dir(entry.path, dst_path, hardlinks, summary)
+            else:
+                _sync_file(entry.path, dst_path, entry.stat(), hardlinks, summary)
+
+    # Anything that is no longer in the source would have been removed by
+    # rmtree + copytree too.
+    with os.scandir(dst) as entries:
+        for entry in entries:
+            if entry.name in names:
+                continue
+
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.remove(entry.path)
+
+            summary["removed"] += 1
+
+    shutil.copystat(src, dst)
+
+def _sync_symlink(src, dst, summary):
+    target = os.readlink(src)
+
+    if os.path.islink(dst) \
+            and os.readlink(dst) == target:
+        summary["unchanged"] += 1
+        return
+
+    _remove(dst)
+
+    os.symlink(target, dst)
+
+    summary["copied"] += 1
+
+def _sync_file(src, dst, src_stat, hardlinks, summary):
+    try:
+        dst_stat = os.lstat(dst)
+    except FileNotFoundError:
+        dst_stat = None
+
+    if dst_stat is not None \
+            and stat.S_ISREG(dst_stat.st_mode):
+        if hardlinks \
+                and (dst_stat.st_dev, dst_stat.st_ino) == (src_stat.st_dev, src_stat.st_ino):
+            summary["unchanged"] += 1
+            return
+
+        if dst_stat.st_size == src_stat.st_size:
+            if dst_stat.st_mtime_ns == src_stat.st_mtime_ns:
+                summary["unchanged"] += 1
+                return
+
+            # Same size but a different mtime, e.g. the project was touched
+            # or checked out again: compare the contents before copying.
+            if _hash_file(src) == _hash_file(dst):
+                shutil.copystat(src, dst)
+
+                summary["unchanged"] += 1
+                return
+
+    tmpname = os.path.join(os.path.dirname(dst), f".{os.path.basename(dst)}.sync")
+
+    _remove(tmpname)
+
+    linked = False
+
+    if hardlinks:
+        try:
+            os.link(src, tmpname)
+
+            linked = True
+        except OSError:
+            pass
+
+    if not linked:
+        try:
+            _copy_file(src, tmpname)
+
+            shutil.copystat(src, tmpname)
+        except BaseException:
+            _remove(tmpname)
+
+            raise
+
+    if dst_stat is not None \
+            and stat.S_ISDIR(dst_stat.st_mode):
+        shutil.rmtree(dst)
+
+    # Renaming never writes through an existing hard link.
+    os.replace(tmpname, dst)
+
+    if linked:
+        summary["linked"] += 1
+    else:
+        summary["copied"] += 1
+
+def write_files(directory, files):
+    pending = []
+
+    try:
+        for (filename, content) in files.items():
+            pathname = os.path.join(directory, filename)
+            data = content.encode()
+
+            if _same_content(pathname, data):
+                continue
+
+            tmpname = os.path.join(os.path.dirname(pathname), f".{os.path.basename(pathname)}.write")
+
+            # Tracked before writing so a failed write doesn't leave it behind.
+            pending.append((tmpname, pathname))
+
+            with open(tmpname, "wb") as fd:
+                fd.write(data)
+                fd.flush()
+
+                os.fsync(fd.fileno())
+
+            if os.path.isfile(pathname):
+                shutil.copymode(pathname, tmpname)
+    except BaseException:
+        for (tmpname, _) in pending:
+            _remove(tmpname)
+
+        raise
+
+    # Nothing is replaced until every file has been written.
+    for (tmpname, pathname) in pending:
+        os.replace(tmpname, pathname)
+
+    return [pathname for (_, pathname) in pending]
+
+def _same_content(pathname, data):
+    try:
+        file_stat = os.stat(pathname)
+    except FileNotFoundError:
+        return False
+
+    if not stat.S_ISREG(file_stat.st_mode) \
+            or file_stat.st_size != len(data):
+        return False
+
+    return _hash_file(pathname) == hashlib.sha256(data).digest()
+
+def _copy_file(src, dst):
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        # copy_file_range(2) lets the kernel clone the blocks when the file
+        # system supports it (e.g. ZFS block cloning or Btrfs).
+        if hasattr(os, "copy_file_range"):
+            try:
+                while os.copy_file_range(fsrc.fileno(), fdst.fileno(), COPY_CHUNK_SIZE) > 0:
+                    pass
+
+                return
+            except OSError:
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+
+        shutil.copyfileobj(fsrc, fdst, COPY_CHUNK_SIZE)
+
+def _hash_file(pathname):
+    digest = hashlib.sha256()
+
+    with open(pathname, "rb") as fd:
+        while True:
+            chunk = fd.read(HASH_CHUNK_SIZE)
+
+            if chunk == b"":
+                break
+
+            digest.update(chunk)
+
+    return digest.digest()
+
+def _remove(pathname):
+    if os.path.isdir(pathname) \
+            and not os.path.islink(pathname):
+        shutil.rmtree(pathname)
+        return
+
+    try:
+        os.remove(pathname)
+    except FileNotFoundError:
+        pass
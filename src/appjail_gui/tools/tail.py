@@ -0,0 +1,216 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import collections
+import os
+
+from nicegui import background_tasks, run
+from nicegui.logging import log
+
+from appjail_gui.tools.constants import TAIL_BACKLOG_SIZE
+from appjail_gui.tools.constants import TAIL_INTERVAL
+from appjail_gui.tools.constants import TAIL_KEEPALIVE
+from appjail_gui.tools.constants import TAIL_QUEUE_LINES
+from appjail_gui.tools.constants import TAIL_READ_SIZE
+from appjail_gui.tools.text import LineDecoder
+
+_watchers = {}
+
+class Subscriber:
+    def __init__(self):
+        self.lines = collections.deque()
+        self.dropped = 0
+        self.closed = False
+        self.event = asyncio.Event()
+
+    def put(self, lines):
+        self.lines.extend(lines)
+
+        # A slow consumer loses the oldest lines instead of making the
+        # server buffer without limit.
+        overflow = len(self.lines) - TAIL_QUEUE_LINES
+
+        for _ in range(overflow):
+            self.lines.popleft()
+
+        if overflow > 0:
+            self.dropped += overflow
+
+        self.event.set()
+
+    def close(self):
+        self.closed = True
+        self.event.set()
+
+class FileWatcher:
+    def __init__(self, pathname):
+        self.pathname = pathname
+        self.subscribers = set()
+        self.backlog = collections.deque(maxlen=TAIL_QUEUE_LINES)
+        self.offset = None
+        self.decoder = LineDecoder()
+        self.task = None
+
+    def subscribe(self):
+        subscriber = Subscriber()
+
+        if len(self.backlog) > 0:
+            subscriber.put(self.backlog)
+
+        self.subscribers.add(subscriber)
+
+        if self.task is None:
+            self.task = background_tasks.create(self.follow(), name=f"tail {self.pathname}")
+
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self.subscribers.discard(subscriber)
+
+        if len(self.subscribers) == 0:
+            if self.task is not None:
+                self.task.cancel()
+
+            _watchers.pop(self.pathname, None)
+
+    async def follow(self):
+        while True:
+            try:
+                lines = await run.io_bound(self.read)
+            except Exception:
+                log.exception(f"An exception occurred while following '{self.pathname}'")
+
+                lines = None
+
+            if lines:
+                self.backlog.extend(lines)
+
+                for subscriber in list(self.subscribers):
+                    subscriber.put(lines)
+
+            await asyncio.sleep(TAIL_INTERVAL)
+
+    def read(self):
+        try:
+            size = os.stat(self.pathname).st_size
+        except FileNotFoundError:
+            return []
+
+        align = False
+
+        if self.offset is None:
+            # Start with the tail of the file, from the beginning of a line.
+            self.offset = max(0, size - TAIL_BACKLOG_SIZE)
+
+            align = self.offset > 0
+        elif size < self.offset:
+            # The file was truncated or replaced.
+            self.offset = 0
+            self.decoder = LineDecoder()
+
+        if size == self.offset:
+            return []
+
+        with open(self.pathname, "rb") as fd:
+            if align:
+                fd.seek(self.offset - 1)
+
+                align = fd.read(1) != b"\n"
+            else:
+                fd.seek(self.offset)
+
+            data = fd.read(min(size - self.offset, TAIL_READ_SIZE))
+
+        self.offset += len(data)
+
+        lines = self.decoder.feed(data)
+
+        if align:
+            lines = lines[1:]
+
+        return lines
+
+def follow_file(pathname):
+    watcher = _watchers.get(pathname)
+
+    # Every subscriber of the same file shares one watcher.
+    if watcher is None:
+        watcher = _watchers[pathname] = FileWatcher(pathname)
+
+    return (watcher, watcher.subscribe())
+
+async def follow_job(job):
+    subscriber = Subscriber()
+    # stream_output() already removed the escape sequences of the jobs.
+    subscriber.put(await job.get_output())
+
+    if not job.is_active():
+        subscriber.close()
+
+        return (subscriber, None)
+
+    def on_job_event(job, line):
+        if line is not None:
+            subscriber.put((line,))
+        elif not job.is_active():
+            subscriber.close()
+
+    job.listeners.add(None, on_job_event)
+
+    return (subscriber, on_job_event)
+
+async def stream_events(subscriber):
+    while True:
+        try:
+            await asyncio.wait_for(subscriber.event.wait(), TAIL_KEEPALIVE)
+        except asyncio.TimeoutError:
+            yield ": keepalive\n\n"
+            continue
+
+        subscriber.event.clear()
+
+        if subscriber.dropped > 0:
+            yield f"event: dropped\ndata: {subscriber.dropped}\n\n"
+
+            subscriber.dropped = 0
+
+        if len(subscriber.lines) > 0:
+            lines = list(subscriber.lines)
+
+            subscriber.lines.clear()
+
+            # Everything that arrived since the last event is sent as one.
+            yield "".join(
+                f"data: {part}\n" for line in lines for part in line.split("\n")
+            ) + "\n"
+
+        if subscriber.closed:
+            yield "event: end\ndata: \n\n"
+            return
@@ -27,14 +27,118 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import codecs
 import re
 
+ANSI_PATTERN = re.compile(r"(?:\x9B|\x1B\[)[0-?]*[ -\/]*[@-~]")
+# An escape sequence that has not yet received its final byte.
+ANSI_PARTIAL_PATTERN = re.compile(r"(?:\x9B|\x1B\[?)[0-?]*[ -\/]*")
+ANSI_MAX_PARTIAL = 64
+# A line that grows past this size without a line break (e.g. a progress
+# bar) is emitted in pieces.
+LINE_MAX_SIZE = 64 * 1024
+# The line boundaries of str.splitlines() other than "\n", "\r" and "\r\n".
+LINE_BREAK_PATTERN = re.compile(r"[\x0b\x0c\x1c-\x1e\x85\u2028\u2029]")
+
 def sansi(content):
-    lines = []
+    # Same line endings that str.splitlines() + "\n".join() gave. They are
+    # normalized before removing the escape sequences so that "\r\x1b[0m\n"
+    # is still two line breaks.
+    content = normalize_lines(content)
+    content = ANSI_PATTERN.sub("", content)
+
+    if content.endswith("\n"):
+        content = content[:-1]
+
+    return content
+
+def normalize_lines(content):
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+
+    return LINE_BREAK_PATTERN.sub("\n", content)
+
+class ANSIStripper:
+    def __init__(self):
+        self.partial = ""
+
+    def feed(self, chunk):
+        content = self.partial + chunk
+
+        self.partial = ""
+
+        if content.endswith("\r"):
+            # It may be the first half of "\r\n".
+            self.partial = "\r"
+
+            content = content[:-1]
+        else:
+            index = max(content.rfind("\x1B"), content.rfind("\x9B"))
+
+            if index != -1 \
+                    and len(content) - index <= ANSI_MAX_PARTIAL \
+                    and ANSI_PARTIAL_PATTERN.fullmatch(content, index) is not None:
+                self.partial = content[index:]
+
+                content = content[:index]
+
+        return self._strip(content)
+
+    def flush(self):
+        content = self.partial
+
+        self.partial = ""
+
+        return self._strip(content)
+
+    def _strip(self, content):
+        # Same order as sansi().
+        content = normalize_lines(content)
+
+        return ANSI_PATTERN.sub("", content)
+
+class LineDecoder:
+    def __init__(self):
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.stripper = ANSIStripper()
+        self.partial = []
+        self.partial_size = 0
+
+    def feed(self, data):
+        # ANSIStripper turns "\r" into a line break too, so progress bars
+        # are shown as they are written.
+        return self._split(self.stripper.feed(self.decoder.decode(data)))
+
+    def flush(self):
+        lines = self._split(self.stripper.feed(self.decoder.decode(b"", True)) + self.stripper.flush())
+
+        if self.partial_size > 0:
+            lines.append(self._take_partial())
+
+        return lines
+
+    def _split(self, content):
+        lines = content.split("\n")
+        last = lines.pop()
+
+        # The pieces of an unfinished line are joined only once.
+        if len(lines) > 0 \
+                and self.partial_size > 0:
+            lines[0] = self._take_partial() + lines[0]
+
+        if last != "":
+            self.partial.append(last)
+            self.partial_size += len(last)
+
+            if self.partial_size >= LINE_MAX_SIZE:
+                lines.append(self._take_partial())
+
+        return lines
 
-    for line in content.splitlines():
-        line = re.sub(r"(\x9B|\x1B\[)[0-?]*[ -\/]*[@-~]", "", line)
+    def _take_partial(self):
+        content = "".join(self.partial)
 
-        lines.append(line)
+        self.partial = []
+        self.partial_size = 0
 
-    return "\n".join(lines)
+        return content
@@ -0,0 +1,168 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+from nicegui import app
+from nicegui.logging import log
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from appjail_gui.tools.constants import IMAGE_HEIGHT
+from appjail_gui.tools.constants import IMAGE_WIDTH
+from appjail_gui.tools.constants import THUMBNAILS_DIR
+from appjail_gui.tools.metrics import run_cpu_bound
+
+THUMBNAILS_ROUTE = "/thumbnails"
+THUMBNAILS_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_thumbnails = {}
+_pending = {}
+
+@app.get(THUMBNAILS_ROUTE + "/{name}")
+async def thumbnail_handler(request: Request, name: str):
+    if re.match(r"^[0-9a-f]{64}\.png$", name) is None:
+        return Response(status_code=404)
+
+    pathname = os.path.join(THUMBNAILS_DIR, name)
+
+    if not os.path.isfile(pathname):
+        return Response(status_code=404)
+
+    # The name is the hash of the content, so it is also a strong ETag.
+    etag = '"%s"' % name.split(".")[0]
+
+    headers = {
+        "ETag" : etag,
+        "Cache-Control" : THUMBNAILS_CACHE_CONTROL
+    }
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(pathname, media_type="image/png", headers=headers)
+
+def thumbnails_enabled():
+    return Image is not None
+
+def thumbnail_key(image):
+    try:
+        stat = os.stat(image)
+    except OSError:
+        return
+
+    return (image, stat.st_mtime_ns, stat.st_size)
+
+def get_thumbnail_url(image):
+    key = thumbnail_key(image)
+
+    if key is None:
+        return
+
+    name = _thumbnails.get(key)
+
+    if name is None:
+        return
+
+    return f"{THUMBNAILS_ROUTE}/{name}"
+
+async def make_thumbnail(image):
+    key = thumbnail_key(image)
+
+    if key is None:
+        return
+
+    if key in _thumbnails:
+        return get_thumbnail_url(image)
+
+    # Several clients may ask for the same image at the same time, but
+    # only one of them should create it.
+    task = _pending.get(key)
+
+    if task is None:
+        task = asyncio.ensure_future(
+            run_cpu_bound(create_thumbnail, image, THUMBNAILS_DIR, IMAGE_WIDTH, IMAGE_HEIGHT)
+        )
+
+        _pending[key] = task
+
+    try:
+        name = await task
+    except Exception:
+        log.exception(f"{image}: An exception occurred while creating the thumbnail")
+        return
+    finally:
+        _pending.pop(key, None)
+
+    _thumbnails[key] = name
+
+    return get_thumbnail_url(image)
+
+def create_thumbnail(image, directory, width, height):
+    with open(image, "rb") as fd:
+        content = fd.read()
+
+    digest = hashlib.sha256(content)
+    digest.update(f"{width}x{height}".encode())
+
+    name = f"{digest.hexdigest()}.png"
+    pathname = os.path.join(directory, name)
+
+    if os.path.isfile(pathname):
+        return name
+
+    os.makedirs(directory, exist_ok=True)
+
+    with Image.open(image) as img:
+        img.thumbnail((width, height))
+
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA")
+
+        (fd, tmpname) = tempfile.mkstemp(dir=directory, prefix=".thumbnail-")
+
+        try:
+            with os.fdopen(fd, "wb") as fd:
+                img.save(fd, format="PNG", optimize=True)
+
+            os.replace(tmpname, pathname)
+        except:
+            os.remove(tmpname)
+            raise
+
+    return name
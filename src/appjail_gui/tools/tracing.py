@@ -0,0 +1,111 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import collections
+import contextlib
+import contextvars
+import os
+import shlex
+import time
+
+from nicegui.logging import log
+
+from appjail_gui.tools.constants import SLOW_COMMAND
+from appjail_gui.tools.constants import TRACES_SIZE
+from appjail_gui.tools.metrics import command_labels
+
+_traces = collections.deque(maxlen=TRACES_SIZE)
+_action = contextvars.ContextVar("action", default=None)
+
+@contextlib.contextmanager
+def trace_action(action):
+    # Commands spawned inside this block (and by the tasks created from it)
+    # are attributed to the given action.
+    token = _action.set(action)
+
+    try:
+        yield
+    finally:
+        _action.reset(token)
+
+def record_trace(cmd, cwd, started, duration, returncode, output_bytes):
+    trace = {
+        "command" : shlex.join(cmd),
+        "label" : command_labels(cmd)["command"],
+        "cwd" : cwd if cwd is not None else os.getcwd(),
+        "action" : _action.get() or "-",
+        "started" : started,
+        "duration" : duration,
+        "returncode" : returncode,
+        "output_bytes" : output_bytes
+    }
+
+    _traces.append(trace)
+
+    if SLOW_COMMAND > 0 \
+            and duration >= SLOW_COMMAND:
+        log.warning(f"Slow command ({duration:.3f}s, exit {returncode}, action {trace['action']}): {trace['command']}")
+
+def get_traces():
+    return list(_traces)
+
+def slowest_commands(limit):
+    return sorted(_traces, key=lambda trace: trace["duration"], reverse=True)[:limit]
+
+def summarize_traces(key, limit):
+    summary = {}
+
+    for trace in _traces:
+        name = trace[key]
+
+        if name not in summary:
+            summary[name] = {
+                key : name,
+                "count" : 0,
+                "total" : 0.0,
+                "max" : 0.0,
+                "output_bytes" : 0
+            }
+
+        entry = summary[name]
+        entry["count"] += 1
+        entry["total"] += trace["duration"]
+        entry["max"] = max(entry["max"], trace["duration"])
+        entry["output_bytes"] += trace["output_bytes"]
+
+    return sorted(summary.values(), key=lambda entry: entry["count"], reverse=True)[:limit]
+
+def frequent_commands(limit):
+    return summarize_traces("label", limit)
+
+def action_fanout(limit):
+    return summarize_traces("action", limit)
+
+def format_started(started):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started))
@@ -0,0 +1,172 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2024, Jesús Daniel Colmenares Oviedo <DtxdF@disroot.org>
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import collections
+import os
+import sys
+import threading
+import time
+import traceback
+
+from nicegui import background_tasks
+from nicegui.logging import log
+
+from appjail_gui.tools.constants import WATCHDOG
+from appjail_gui.tools.constants import WATCHDOG_HISTORY
+from appjail_gui.tools.constants import WATCHDOG_INTERVAL
+from appjail_gui.tools.constants import WATCHDOG_THRESHOLD
+
+_pkgdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_stalls = collections.deque(maxlen=WATCHDOG_HISTORY)
+_offenders = {}
+_lock = threading.Lock()
+_heartbeat = None
+_loop_thread = None
+
+def watchdog_enabled():
+    return WATCHDOG
+
+def start_watchdog():
+    global _heartbeat, _loop_thread
+
+    if not WATCHDOG:
+        return
+
+    # Startup hooks run on the thread of the event loop.
+    _loop_thread = threading.get_ident()
+    _heartbeat = time.monotonic()
+
+    background_tasks.create(beat(), name="watchdog_heartbeat")
+
+    threading.Thread(target=watch_loop, name="watchdog", daemon=True).start()
+
+    log.info(f"Watchdog enabled (threshold: {WATCHDOG_THRESHOLD}s)")
+
+async def beat():
+    global _heartbeat
+
+    while True:
+        _heartbeat = time.monotonic()
+
+        await asyncio.sleep(WATCHDOG_INTERVAL)
+
+def watch_loop():
+    stall = None
+
+    while True:
+        time.sleep(WATCHDOG_INTERVAL)
+
+        heartbeat = _heartbeat
+        lag = time.monotonic() - heartbeat - WATCHDOG_INTERVAL
+
+        if stall is not None \
+                and stall["heartbeat"] != heartbeat:
+            finish_stall(stall)
+
+            stall = None
+
+        if stall is None \
+                and lag >= WATCHDOG_THRESHOLD:
+            stall = capture_stall(heartbeat, lag)
+
+        if stall is not None:
+            stall["lag"] = max(stall["lag"], lag)
+
+def capture_stall(heartbeat, lag):
+    frame = sys._current_frames().get(_loop_thread)
+
+    if frame is None:
+        stack = []
+    else:
+        stack = traceback.extract_stack(frame)
+
+    # Everything up to the event loop is the same for all stalls (cli,
+    # uvicorn, asyncio), so it is dropped.
+    for index in range(len(stack) - 1, -1, -1):
+        if os.path.basename(os.path.dirname(stack[index].filename)) == "asyncio":
+            stack = stack[index + 1:]
+            break
+
+    return {
+        "heartbeat" : heartbeat,
+        "started" : time.time() - lag,
+        "lag" : lag,
+        "site" : find_site(stack),
+        "stack" : "".join(traceback.format_list(stack))
+    }
+
+def find_site(stack):
+    # The innermost frame that belongs to appjail_gui is the one to blame,
+    # not the library function that happened to block.
+    for frame in reversed(stack):
+        if frame.filename.startswith(_pkgdir) \
+                and not frame.filename.endswith("watchdog.py"):
+            return f"{os.path.relpath(frame.filename, _pkgdir)} ({frame.name})"
+
+    if len(stack) > 0:
+        frame = stack[-1]
+
+        return f"{frame.filename} ({frame.name})"
+
+    return "-"
+
+def finish_stall(stall):
+    del stall["heartbeat"]
+
+    site = stall["site"]
+
+    with _lock:
+        _stalls.append(stall)
+
+        if site not in _offenders:
+            _offenders[site] = {
+                "site" : site,
+                "count" : 0,
+                "total" : 0.0,
+                "max" : 0.0
+            }
+
+        offender = _offenders[site]
+        offender["count"] += 1
+        offender["total"] += stall["lag"]
+        offender["max"] = max(offender["max"], stall["lag"])
+
+    log.warning(f"The event loop was blocked for {stall['lag']:.3f}s at {site}:\n{stall['stack']}")
+
+def get_stalls():
+    with _lock:
+        return list(reversed(_stalls))
+
+def get_offenders():
+    with _lock:
+        offenders = [dict(offender) for offender in _offenders.values()]
+
+    return sorted(offenders, key=lambda offender: offender["total"], reverse=True)